@@ -1,32 +1,131 @@
-from src.algorithms import (
-    bubble_sort,
-    quick_sort,
-    heap_sort,
-    rand_int_array,
-    nearly_sorted,
-    many_duplicates,
-    benchmark
+import argparse
+
+from src.bench import (
+    ALGORITHMS, GENERATORS,
+    run_suite, format_table, write_json, write_csv,
+    sweep, geometric_sizes, fit_sweep, crossovers,
+    parallel_scaling, NUMERIC, run_numeric, structure_benchmark,
+    contention_benchmark, DatasetCache, DATASET_CACHE_DIR, DATASET_CACHE_MAX,
+    property_check, read_json, compare_baseline, format_regressions, BASELINE_PATH, BASELINE_TOLERANCE,
 )
+import os
+
+
+def _pick(registry, names):
+    if not names:
+        return registry
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        raise SystemExit(f"Неизвестные имена: {', '.join(unknown)}")
+    return {name: registry[name] for name in names}
+
+
+def _print_fits(results):
+    fits = fit_sweep(results)
+    print("\nАсимптотика:")
+    for name, fit in fits.items():
+        print(f"  {name:<10} {fit['model']:<11} ошибка {fit['fits'][fit['model']]['error']:.3f}")
+    print("\nТочки пересечения:")
+    for c in crossovers(fits):
+        print(f"  n ≈ {c['n']}: до — {c['below']}, после — {c['above']}")
+
+
+def benchmmark_run(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк сортировок")
+    parser.add_argument("-n", type=int, default=1000, help="размер массива")
+    parser.add_argument("--repeat", type=int, default=5, help="число замеров")
+    parser.add_argument("--warmup", type=int, default=1, help="число прогревочных прогонов")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--algos", nargs="*", help=f"из: {', '.join(ALGORITHMS)}")
+    parser.add_argument("--generators", nargs="*", help=f"из: {', '.join(GENERATORS)}")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    parser.add_argument("--csv", help="сохранить результаты в CSV")
+    parser.add_argument("--sweep", action="store_true", help="развёртка по размерам и подбор асимптотики")
+    parser.add_argument("--min-size", type=int, default=100)
+    parser.add_argument("--max-size", type=int, default=10 ** 5)
+    parser.add_argument("--per-decade", type=int, default=2, help="размеров на декаду")
+    parser.add_argument("--budget", type=float, default=2.0, help="макс. секунд на один прогон в развёртке")
+    parser.add_argument("--parallel", action="store_true", help="масштабирование parallel_sort по числу процессов")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4])
+    parser.add_argument("--numeric", type=int, nargs="*", metavar="N",
+                        help=f"бенчмарк {', '.join(NUMERIC)} для заданных n")
+    parser.add_argument("--structures", action="store_true", help="память и скорость Stack/Queue и типизированных версий")
+    parser.add_argument("--contention", action="store_true",
+                        help="очереди под нагрузкой: --workers задаёт число producers/consumers")
+    parser.add_argument("--cache", action="store_true", help="брать входные массивы из кэша на диске")
+    parser.add_argument("--cache-dir", default=DATASET_CACHE_DIR)
+    parser.add_argument("--cache-size", type=int, default=DATASET_CACHE_MAX // 2 ** 20, help="размер кэша в МБ")
+    parser.add_argument("--check", action="store_true",
+                        help="проверка корректности: результат отсортирован, это перестановка входа, стабильность")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_PATH, metavar="PATH",
+                        help="сравнить с базовой линией (если файла нет — записать её)")
+    parser.add_argument("--update-baseline", action="store_true", help="перезаписать базовую линию")
+    parser.add_argument("--tolerance", type=float, default=BASELINE_TOLERANCE,
+                        help="допустимое замедление, доля (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    cache = DatasetCache(args.cache_dir, args.cache_size * 2 ** 20) if args.cache else None
 
-def benchmmark_run():
-    arrays = {
-        "Random (100)":    rand_int_array(100, 0, 1000, seed=42),
-        "Nearly sorted":   nearly_sorted(100, 5, seed=42),
-        "Many duplicates": many_duplicates(100, k=10, seed=42),
-    }
-
-    algos = {
-        "Bubble": bubble_sort,
-        "Quick":  quick_sort,
-        "Heap":   heap_sort,
-    }
-
-    results = benchmark(arrays, algos)
-
-    for array_name, timings in results.items():
-        print(f"{array_name}:")
-        for algo_name, t in timings.items():
-            print(f"  {algo_name}: {t * 1000:.4f} ms")
+    if args.check:
+        failures = property_check(_pick(ALGORITHMS, args.algos), _pick(GENERATORS, args.generators))
+        for f in failures:
+            print(f"{f['algorithm']:<16} {f['generator']:<11} n={f['n']:<6} seed={f['seed']}: {f['problem']}")
+        if failures:
+            raise SystemExit(1)
+        print("Все сортировки прошли проверку")
+        return
+    if args.contention:
+        results = contention_benchmark(args.n, args.workers, repeat=args.repeat)
+        print(format_table(results))
+    elif args.structures:
+        results = structure_benchmark(args.n, repeat=args.repeat)
+        for r in results:
+            print(f"{r['algorithm']:<16} {r['median_ns'] / 1e6:>10.2f} ms  "
+                  f"пик памяти {r['peak_bytes'] / 1024 / 1024:>8.2f} МБ")
+    elif args.numeric is not None:
+        results = run_numeric(
+            _pick(NUMERIC, args.algos), args.numeric or [1000, 10000, 100000], repeat=args.repeat,
+        )
+        print(format_table(results))
+    elif args.parallel:
+        results = parallel_scaling(
+            args.n, args.workers, _pick(ALGORITHMS, args.algos) if args.algos else None,
+            generator=(args.generators or ["random"])[0], seed=args.seed, repeat=args.repeat, cache=cache,
+        )
+        for r in results:
+            label = "последовательно" if r["workers"] == 0 else f"{r['workers']} процесс(ов)"
+            print(f"{r['algorithm']:<24} {label:<16} {r['median_ns'] / 1e6:>10.2f} ms  x{r['speedup']:.2f}")
+    elif args.sweep:
+        generator = args.generators[0] if args.generators else "random"
+        _pick(GENERATORS, [generator])
+        results = sweep(
+            _pick(ALGORITHMS, args.algos), generator,
+            sizes=geometric_sizes(args.min_size, args.max_size, args.per_decade),
+            seed=args.seed, repeat=args.repeat, warmup=args.warmup, time_budget=args.budget, cache=cache,
+        )
+        print(format_table(results))
+        _print_fits(results)
+    else:
+        results = run_suite(
+            _pick(ALGORITHMS, args.algos),
+            _pick(GENERATORS, args.generators),
+            n=args.n, seed=args.seed, repeat=args.repeat, warmup=args.warmup, cache=cache,
+        )
+        print(format_table(results))
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.baseline:
+        if args.update_baseline or not os.path.exists(args.baseline):
+            write_json(results, args.baseline)
+            print(f"\nБазовая линия записана в {args.baseline}")
+            return
+        regressions = compare_baseline(results, read_json(args.baseline), tolerance=args.tolerance)
+        if regressions:
+            print("\nРегрессии производительности:")
+            print(format_regressions(regressions))
+            raise SystemExit(1)
+        print("\nРегрессий нет")
 
 
 if __name__ == "__main__":
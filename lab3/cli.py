@@ -1,11 +1,15 @@
 from src.algorithms import (
-    factorial, factorial_recursive,
-    fibo, fibo_recursive,
+    factorial, factorial_recursive, factorial_memo, factorial_fast,
+    fibo, fibo_recursive, fibo_memo, fibo_fast, fibo_mod,
+    FACTORIAL_CACHE, FIBO_CACHE,
     bubble_sort, quick_sort, heap_sort, counting_sort, radix_sort, bucket_sort,
     Stack, Queue,
     rand_int_array, nearly_sorted, many_duplicates,
-    benchmark,
+    benchmark, external_sort, read_numbers, write_numbers,
 )
+import argparse
+import os
+import sys
 
 def _show_menu():
     print("1. Факториал")
@@ -17,18 +21,32 @@ def _show_menu():
     print("7. Тесты")
     print("0. Выход")
 
+# Дальше рекурсивные версии не запускаем: упрутся в лимит рекурсии или будут считать вечно
+MAX_FACTORIAL_RECURSIVE = 900
+MAX_FIBO_RECURSIVE = 30
+
 def _factorial_demo():
     n = int(input("n = "))
     print(f"factorial({n}) = {factorial(n)}")
-    print(f"factorial_recursive({n}) = {factorial_recursive(n)}")
+    if n <= MAX_FACTORIAL_RECURSIVE:
+        print(f"factorial_recursive({n}) = {factorial_recursive(n)}")
+    print(f"factorial_memo({n}) = {factorial_memo(n)}")
+    print(f"  кэш: {FACTORIAL_CACHE.info()}")
 
 def _fibo_demo():
     n = int(input("n = "))
     print(f"fibo({n}) = {fibo(n)}")
-    print(f"fibo_recursive({n}) = {fibo_recursive(n)}")
+    if n <= MAX_FIBO_RECURSIVE:
+        print(f"fibo_recursive({n}) = {fibo_recursive(n)}")
+    print(f"fibo_memo({n}) = {fibo_memo(n)}")
+    print(f"  кэш: {FIBO_CACHE.info()}")
 
 def _sorting_demo():
-    arr = [int(x) for x in input().split()]
+    line = input("Числа через пробел или путь к файлу: ").strip()
+    if os.path.isfile(line):
+        _external_sort_demo(line)
+        return
+    arr = [int(x) for x in line.split()]
     print("Исходный:", arr)
     print("Bubble:", bubble_sort(arr))
     print("Quick:", quick_sort(arr))
@@ -37,6 +55,13 @@ def _sorting_demo():
     print("Radix:", radix_sort(arr))
     print("Bucket:", bucket_sort(arr))
 
+def _external_sort_demo(path):
+    limit = input("Лимит памяти, МБ (Enter — 64): ").strip()
+    memory_limit = int(limit) * 1024 * 1024 if limit else 64 * 1024 * 1024
+    output = path + ".sorted"
+    count = external_sort(path, output, memory_limit=memory_limit)
+    print(f"Отсортировано {count} чисел (внешняя сортировка) → {output}")
+
 def _stack_demo():
     stack = Stack()
     print("Вводите числа для добавления в стек (для выхода введите 'q'):")
@@ -158,17 +183,36 @@ def _benchmark_demo():
 
 def _tests_demo():
     import subprocess
-    import sys
-    import os
-    
-    here = os.path.dirname(__file__)
-    tests_path = os.path.join(here, "tests", "test_algorithms.py")
+    from src.bench import (
+        property_check, rerun_baseline, compare_baseline, format_regressions, read_json, BASELINE_PATH,
+    )
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    tests_path = os.path.join(here, "tests")
 
     result = subprocess.run(
-        [sys.executable, tests_path],
+        [sys.executable, "-m", "unittest", "discover", "-s", tests_path, "-t", here],
+        cwd=here,
         capture_output=False
     )
-    if result.returncode == 0:
+    ok = result.returncode == 0
+
+    print("\nПроверка сортировок (отсортировано, перестановка входа, стабильность)...")
+    failures = property_check()
+    for f in failures:
+        print(f"  {f['algorithm']} на {f['generator']} (n={f['n']}, seed={f['seed']}): {f['problem']}")
+    ok = ok and not failures
+
+    if os.path.exists(BASELINE_PATH):
+        print(f"\nСравнение с базовой линией {BASELINE_PATH}...")
+        regressions = compare_baseline(rerun_baseline(read_json(BASELINE_PATH)), read_json(BASELINE_PATH))
+        if regressions:
+            print(format_regressions(regressions))
+        ok = ok and not regressions
+    else:
+        print("\nБазовой линии нет: python benchmark.py --baseline")
+
+    if ok:
         print("Все тесты прошли успешно!")
     else:
         print("Некоторые тесты не прошли.")
@@ -199,3 +243,144 @@ def run_cli():
                 print("Ошибка: неверный выбор")
         except Exception as e:
             print("Ошибка:", e)
+
+
+# Неинтерактивный режим: python main.py <команда> ...
+def _tokens(f):
+    for line in f:
+        yield from line.split()
+
+
+def _open_in(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8")
+
+
+def _open_out(path):
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _cmd_sort(args):
+    from src.bench import ALGORITHMS, INT_ONLY
+
+    if args.algo not in ALGORITHMS:
+        raise SystemExit(f"Неизвестная сортировка: {args.algo} (из: {', '.join(ALGORITHMS)})")
+    typecode = "d" if args.float else "q"
+    if args.float and args.algo in INT_ONLY:
+        raise SystemExit(f"{args.algo} сортирует только целые числа")
+    kernel = ALGORITHMS[args.algo]
+    src = _open_in(args.input)
+    dst = _open_out(args.output)
+    try:
+        if args.external:
+            # Вход читается кусками, отсортированные куски сливаются с диска
+            count = external_sort(_tokens(src), dst, memory_limit=args.memory * 1024 * 1024,
+                                  kernel=kernel, typecode=typecode)
+        else:
+            result = kernel(list(read_numbers(_tokens(src), typecode)))
+            count = write_numbers(iter(result), dst)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    if args.output != "-":
+        print(f"Отсортировано {count} чисел → {args.output}", file=sys.stderr)
+
+
+def _cmd_bench(args):
+    from src.bench import (
+        ALGORITHMS, GENERATORS, run_suite, format_table, write_json, write_csv, DatasetCache,
+    )
+    from benchmark import _pick
+
+    algos = _pick(ALGORITHMS, args.algos)
+    generators = _pick(GENERATORS, args.generators)
+    cache = DatasetCache() if args.cache else None
+    results = []
+    for n in args.sizes:
+        results += run_suite(algos, generators, n=n, seed=args.seed, repeat=args.repeat,
+                             warmup=args.warmup, cache=cache)
+    dst = _open_out(args.output)
+    try:
+        if args.format == "json":
+            write_json(results, dst)
+            dst.write("\n")
+        elif args.format == "csv":
+            write_csv(results, dst)
+        else:
+            dst.write(format_table(results) + "\n")
+    finally:
+        if dst is not sys.stdout:
+            dst.close()
+
+
+def _print_big(value):
+    # Без этого Python 3.11+ отказывается печатать числа длиннее 4300 цифр
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+    print(value)
+
+
+def _cmd_fib(args):
+    if args.mod is None:
+        _print_big(fibo_fast(args.n))
+        return
+    if args.mod <= 0:
+        raise SystemExit("Ошибка: модуль должен быть > 0")
+    _print_big(fibo_mod(args.n, args.mod))
+
+
+def _cmd_fact(args):
+    _print_big(factorial_fast(args.n))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Алгоритмы lab3 без интерактивного меню")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sort", help="отсортировать числа из файла или stdin")
+    p.add_argument("--algo", default="sort", help="сортировка из bench.ALGORITHMS (по умолчанию sort)")
+    p.add_argument("--input", "-i", default="-", help="файл с числами через пробелы/переводы строк, '-' — stdin")
+    p.add_argument("--output", "-o", default="-", help="куда писать, по числу на строку; '-' — stdout")
+    p.add_argument("--float", action="store_true", help="числа с плавающей точкой")
+    p.add_argument("--external", action="store_true", help="внешняя сортировка для входа больше памяти")
+    p.add_argument("--memory", type=int, default=64, help="лимит памяти для --external, МБ")
+    p.set_defaults(func=_cmd_sort)
+
+    p = sub.add_parser("bench", help="бенчмарк сортировок")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000])
+    p.add_argument("--algos", nargs="*")
+    p.add_argument("--generators", nargs="*")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--warmup", type=int, default=1)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--format", choices=["table", "json", "csv"], default="table")
+    p.add_argument("--output", "-o", default="-")
+    p.add_argument("--cache", action="store_true", help="брать входные массивы из кэша на диске")
+    p.set_defaults(func=_cmd_bench)
+
+    p = sub.add_parser("fib", help="N-е число Фибоначчи")
+    p.add_argument("n", type=int)
+    p.add_argument("--mod", type=int, help="по модулю")
+    p.set_defaults(func=_cmd_fib)
+
+    p = sub.add_parser("fact", help="N!")
+    p.add_argument("n", type=int)
+    p.set_defaults(func=_cmd_fact)
+    return parser
+
+
+def run_args(argv):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        # Вывод отдали в head и т.п. — не считаем ошибкой
+        sys.stderr.close()
+    except (ValueError, OverflowError, OSError) as e:
+        # OverflowError — число не помещается в int64 при упаковке (sort --external)
+        raise SystemExit(f"Ошибка: {e}")
@@ -1,7 +1,15 @@
-from cli import run_cli
+import sys
 
-def main():
-    run_cli()
+from cli import run_cli, run_args
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    # С аргументами — неинтерактивный режим, без них — меню
+    if argv:
+        run_args(argv)
+    else:
+        run_cli()
 
 if __name__ == "__main__":
     main()
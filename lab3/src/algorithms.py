@@ -39,6 +39,257 @@ def fibo_recursive(n):
         return 1
     return fibo_recursive(n - 1) + fibo_recursive(n - 2)
 
+def factorial_fast(n):
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    # n! = (произведение нечётных частей) * 2^(n - popcount(n)).
+    # Нечётная часть = P(n) * P(n/2) * P(n/4) * ..., где P(m) — произведение нечётных <= m.
+    # Множители перемножаются деревом, поэтому большие числа умножаются на числа сопоставимого размера.
+    p = 1
+    r = 1
+    for k in range(n.bit_length() - 1, -1, -1):
+        p *= _odd_product(n >> (k + 1), n >> k)
+        r *= p
+    return r << (n - bin(n).count("1"))
+
+
+def _odd_product(lo, hi):
+    # Произведение нечётных чисел из (lo, hi]
+    first = (lo + 1) | 1
+    last = hi if hi & 1 else hi - 1
+    if last < first:
+        return 1
+    return _odd_range_product(first, (last - first) // 2 + 1)
+
+
+def _odd_range_product(start, count):
+    if count <= 16:
+        result = 1
+        for x in range(start, start + 2 * count, 2):
+            result *= x
+        return result
+    half = count // 2
+    return _odd_range_product(start, half) * _odd_range_product(start + 2 * half, count - half)
+
+
+def fibo_fast(n):
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    return _fibo_pair(n)[0]
+
+
+def _fibo_pair(n):
+    # Быстрое удвоение: F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibo_mod(n, m):
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if m < 1:
+        raise ValueError("m must be >= 1")
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        if bit == "1":
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a
+
+# Кэш для factorial/fibo: LRU со статистикой + готовая таблица для маленьких n
+import json
+import os
+from collections import OrderedDict
+
+class MemoCache:
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    def get(self, key, default=None):
+        if key in self.data:
+            self.hits += 1
+            self.data.move_to_end(key)
+            return self.data[key]
+        self.misses += 1
+        return default
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.data), "maxsize": self.maxsize}
+    def __contains__(self, key):
+        return key in self.data
+    def __len__(self):
+        return len(self.data)
+
+
+FIBO_CACHE = MemoCache(1024)
+FACTORIAL_CACHE = MemoCache(1024)
+
+SMALL_TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "small_tables.json")
+_small_tables = None
+
+def _small_table(kind):
+    # Таблица читается с диска только при первом обращении
+    global _small_tables
+    if _small_tables is None:
+        try:
+            with open(SMALL_TABLES_PATH, "r", encoding="utf-8") as f:
+                _small_tables = json.load(f)
+        except (OSError, ValueError):
+            _small_tables = {
+                "factorial": [factorial(n) for n in range(100)],
+                "fibo": [fibo(n) for n in range(200)],
+            }
+    return _small_tables[kind]
+
+
+def fibo_memo(n):
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    table = _small_table("fibo")
+    if n < len(table):
+        return table[n]
+    value = FIBO_CACHE.get(n)
+    if value is None:
+        prev, value = _fibo_from_checkpoint(n, table)
+        # Сохраняем пару, чтобы следующие вызовы могли продолжить отсюда
+        FIBO_CACHE.put(n - 1, prev)
+        FIBO_CACHE.put(n, value)
+    return value
+
+
+def _fibo_from_checkpoint(n, table):
+    # Вместо рекурсии fibo(n-1) + fibo(n-2) идём циклом вверх от ближайшей известной пары
+    known = FIBO_CACHE.data
+    k = max((m for m in known if m <= n and m - 1 in known), default=len(table) - 1)
+    if n - k > FIBO_JUMP:
+        # Далеко от контрольной точки — удвоением за O(log n) умножений, как в iter_fibos
+        return _fibo_pair(n - 1)
+    if k == len(table) - 1:
+        a, b = table[k - 1], table[k]
+    else:
+        a, b = known[k - 1], known[k]
+    for _ in range(n - k):
+        a, b = b, a + b
+    return a, b
+
+
+def factorial_memo(n):
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    table = _small_table("factorial")
+    if n < len(table):
+        return table[n]
+    value = FACTORIAL_CACHE.get(n)
+    if value is None:
+        known = FACTORIAL_CACHE.data
+        k = max((m for m in known if m <= n), default=len(table) - 1)
+        base = known[k] if k in known else table[k]
+        value = base * _range_product(k + 1, n)
+        FACTORIAL_CACHE.put(n, value)
+    return value
+
+
+def _range_product(lo, hi):
+    # Произведение lo * (lo + 1) * ... * hi деревом
+    if hi < lo:
+        return 1
+    if hi - lo < 16:
+        result = 1
+        for x in range(lo, hi + 1):
+            result *= x
+        return result
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid + 1, hi)
+
+
+def save_memo(path):
+    # hex, потому что str() для чисел длиннее 4300 цифр запрещён
+    data = {
+        "fibo": {str(k): hex(v) for k, v in FIBO_CACHE.data.items()},
+        "factorial": {str(k): hex(v) for k, v in FACTORIAL_CACHE.data.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def load_memo(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for cache, kind in ((FIBO_CACHE, "fibo"), (FACTORIAL_CACHE, "factorial")):
+        for k, v in data.get(kind, {}).items():
+            cache.put(int(k), int(v, 16))
+
+# Пакетный расчёт: много n за один проход
+FIBO_JUMP = 4096  # при разрыве больше этого F(n) считается удвоением, а не шагами
+
+def _check_indices(ns):
+    for n in ns:
+        if n < 0:
+            raise ValueError("n must be >= 0")
+
+
+def iter_factorials(ns):
+    # Отдаёт (n, n!) по возрастанию n, храня только текущее значение
+    wanted = sorted(set(ns))
+    _check_indices(wanted)
+    k, value = 0, 1
+    for n in wanted:
+        value *= _range_product(k + 1, n)
+        k = n
+        yield n, value
+
+
+def iter_fibos(ns):
+    wanted = sorted(set(ns))
+    _check_indices(wanted)
+    k, a, b = 0, 0, 1  # a = F(k), b = F(k + 1)
+    for n in wanted:
+        if n - k > FIBO_JUMP:
+            a, b = _fibo_pair(n)
+        else:
+            for _ in range(n - k):
+                a, b = b, a + b
+        k = n
+        yield n, a
+
+
+def factorials(ns, stream=False):
+    if stream:
+        return iter_factorials(ns)
+    ns = list(ns)
+    values = dict(iter_factorials(ns))
+    return [values[n] for n in ns]
+
+
+def fibos(ns, stream=False):
+    if stream:
+        return iter_fibos(ns)
+    ns = list(ns)
+    values = dict(iter_fibos(ns))
+    return [values[n] for n in ns]
+
 def bubble_sort(arr):
     a = arr.copy()
     n = len(a)
@@ -57,22 +308,40 @@ def quick_sort(arr):
     right = [x for x in arr if x > pivot]
     return quick_sort(left) + middle + quick_sort(right)
 
-def counting_sort(arr):
-    if not arr:
+# Если диапазон значений больше этого, таблица счётчиков не создаётся
+COUNTING_MAX_SPAN_FACTOR = 32
+COUNTING_MIN_SPAN = 1 << 16
+
+def _counting_span_ok(span, n):
+    return span <= max(COUNTING_MIN_SPAN, COUNTING_MAX_SPAN_FACTOR * n)
+
+def counting_sort(arr, backend="python"):
+    if _use_numpy(arr, backend):
+        a = _as_numpy(arr, "iu")
+        if a is not None:
+            return _like_input(_counting_sort_numpy(a), arr)
+    if len(arr) == 0:
         return []
     min_val = min(arr)
     max_val = max(arr)
-    count = [0] * (max_val - min_val + 1)
+    span = max_val - min_val + 1
+    if not _counting_span_ok(span, len(arr)):
+        # Разреженные данные (например [0, 10**9]): считаем словарём, ключи сортируем radix
+        counts = Counter(arr)
+        keys = radix_sort_lsd(list(counts))
+        return list(chain.from_iterable(map(repeat, keys, map(counts.__getitem__, keys))))
+    count = array("l", [0]) * span
     for num in arr:
         count[num - min_val] += 1
-    result = []
-    for i in range(len(count)):
-        for _ in range(count[i]):
-            result.append(i + min_val)
-    return result
+    # Каждое значение повторяется count раз, результат собирается на уровне C
+    return list(chain.from_iterable(map(repeat, range(min_val, max_val + 1), count)))
 
-def radix_sort(arr):
-    if not arr:
+def radix_sort(arr, backend="python"):
+    if _use_numpy(arr, backend):
+        a = _as_numpy(arr, "iu")
+        if a is not None:
+            return _like_input(_radix_sort_numpy(a), arr)
+    if len(arr) == 0:
         return []
     
     negative = [x for x in arr if x < 0]
@@ -120,28 +389,59 @@ def counting_by_digit(arr, exp):
     return output
 
 
-def bucket_sort(arr):
-    if not arr:
-        return []
-    n = len(arr)
-    min_val = min(arr)
-    max_val = max(arr)
+BUCKET_SIZE = 4              # в среднем элементов на корзину
+BUCKET_INSERTION_LIMIT = 32  # корзины не больше этого сортируются вставками
+BUCKET_MAX_DEPTH = 8         # глубже рекурсивного разбиения не идём
+
+def bucket_sort(arr, backend="python"):
+    if _use_numpy(arr, backend):
+        a = _as_numpy(arr, "iuf")
+        if a is not None:
+            result = _bucket_sort_numpy(a)
+            if result is not None:
+                return _like_input(result, arr)
+            if isinstance(arr, np.ndarray):
+                return np.array(_bucket_sort_list(a.tolist(), 0), dtype=a.dtype)
+    return _bucket_sort_list(list(arr), 0)
+
+
+def _bucket_sort_list(a, depth):
+    n = len(a)
+    if n <= BUCKET_INSERTION_LIMIT:
+        _insertion_sort_range(a, 0, n - 1)
+        return a
+    min_val = min(a)
+    max_val = max(a)
     if min_val == max_val:
-        return arr
-    normalized = [(x - min_val) / (max_val - min_val) for x in arr]
-    bucket_count = 10
+        return a
+    if depth >= BUCKET_MAX_DEPTH:
+        return intro_sort(a)
+    bucket_count = max(2, n // BUCKET_SIZE)
+    last = bucket_count - 1
     buckets = [[] for _ in range(bucket_count)]
-    for x in normalized:
-        idx = int(x * bucket_count)
-        if idx == bucket_count:
-            idx -= 1
-        buckets[idx].append(x)
-    for i in range(bucket_count):
-        buckets[i] = bubble_sort(buckets[i])
+    # Номер корзины считается по значению, но в корзину кладётся само значение — без нормализации
+    if isinstance(min_val, int) and isinstance(max_val, int):
+        # Целые — точной целочисленной арифметикой: float переполняется на числах больше ~1e308
+        span = max_val - min_val + 1
+        for x in a:
+            buckets[int((x - min_val) * bucket_count // span)].append(x)
+    else:
+        scale = bucket_count / (max_val - min_val)
+        if not 0 < scale < float("inf"):
+            # Диапазон слишком мал (денормализованные числа) или слишком велик для float
+            return intro_sort(a)
+        for x in a:
+            idx = int((x - min_val) * scale)
+            buckets[idx if idx < last else last].append(x)
     result = []
     for bucket in buckets:
+        if len(bucket) > BUCKET_INSERTION_LIMIT:
+            # Перекошенное распределение: большая корзина делится заново по своему min/max
+            bucket = _bucket_sort_list(bucket, depth + 1)
+        elif len(bucket) > 1:
+            _insertion_sort_range(bucket, 0, len(bucket) - 1)
         result.extend(bucket)
-    return [x * (max_val - min_val) + min_val for x in result]
+    return result
 
 def heap_sort(arr):
     a = arr.copy()
@@ -164,6 +464,569 @@ def heap_sort(arr):
         heapify(i, 0)
     return a
 
+# Побайтовая LSD radix-сортировка для 64-битных целых
+import operator
+import sys
+from array import array
+from collections import Counter
+from functools import reduce
+from itertools import accumulate, chain, islice, repeat
+
+RADIX_BITS = 8
+
+def radix_sort_lsd(arr, bits=RADIX_BITS):
+    if not 1 <= bits <= 16:
+        raise ValueError("bits must be in 1..16")
+    n = len(arr)
+    try:
+        signed = _as_int64_buffer(arr)
+    except OverflowError:
+        # Числа больше 64 бит — только десятичная radix-сортировка
+        return radix_sort(list(arr))
+    if n < 2:
+        return _like_buffer(array("q", signed), arr)
+
+    # Те же байты, прочитанные как беззнаковые: копирование на уровне C, без цикла Python
+    src = array("Q")
+    src.frombytes(signed.tobytes())
+    dst = array("Q", bytes(8 * n))
+    mask = (1 << bits) - 1
+    radix = 1 << bits
+    # Биты, которые различаются хотя бы у двух чисел: проходы по постоянным разрядам пропускаем
+    varying = reduce(operator.or_, map(src[0].__xor__, src))
+    # Порядок корзин при расстановке. В старшем разряде лежит знаковый бит: корзины с ним идут первыми,
+    # так отрицательные числа встают в начало без изменения самих разрядов
+    order = range(radix)
+    top_shift = 63 // bits * bits
+    signed_order = sorted(order, key=(1 << (63 - top_shift)).__xor__)
+    # Буферы выделяются один раз на всю сортировку. Если разряд — целый байт или слово, он читается
+    # прямо из src срезом memoryview с шагом, без копии; иначе разряды пишутся в общий буфер digits
+    aligned = bits in (8, 16)
+    digits = None if aligned else array("H", bytes(2 * n))
+    counts = [0] * radix
+
+    for shift in range(0, 64, bits):
+        if not (varying >> shift) & mask:
+            continue
+        for d in order:
+            counts[d] = 0
+        if aligned:
+            per_word = 64 // bits
+            index = shift // bits if sys.byteorder == "little" else per_word - 1 - shift // bits
+            digits = memoryview(src).cast("B").cast("B" if bits == 8 else "H")[index::per_word]
+            for d in digits:
+                counts[d] += 1
+        else:
+            i = 0
+            for k in src:
+                d = (k >> shift) & mask
+                digits[i] = d
+                counts[d] += 1
+                i += 1
+        total = 0
+        for d in (signed_order if shift == top_shift else order):
+            counts[d], total = total, total + counts[d]
+        for k, d in zip(src, digits):
+            pos = counts[d]
+            dst[pos] = k
+            counts[d] = pos + 1
+        src, dst = dst, src
+
+    result = array("q")
+    result.frombytes(src.tobytes())
+    return _like_buffer(result, arr)
+
+
+def _as_int64_buffer(arr):
+    if isinstance(arr, array) and arr.typecode == "q":
+        return arr
+    if isinstance(arr, memoryview) and arr.format == "q":
+        buf = array("q")
+        buf.frombytes(arr.cast("B"))
+        return buf
+    return array("q", arr)
+
+
+def _like_buffer(result, arr):
+    if isinstance(arr, (array, memoryview)):
+        return result
+    return result.tolist()
+
+
+# NumPy-бэкенды (numpy необязателен: без него всегда работает чистый Python)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_THRESHOLD = 10000
+BACKENDS = ("python", "numpy", "auto")
+
+def _use_numpy(arr, backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend}")
+    if np is None or backend == "python":
+        return False
+    if backend == "numpy":
+        return True
+    return isinstance(arr, np.ndarray) or len(arr) >= NUMPY_THRESHOLD
+
+
+def _as_numpy(arr, kinds):
+    # Список переводится в ndarray, только если типы элементов сохранятся: np.asarray молча
+    # делает float64 из смеси int/float и из int, не помещающихся в int64 (например, [2**63, -1])
+    a = np.asarray(arr)
+    if a.dtype.kind not in kinds:
+        return None
+    if a.dtype.kind == "f" and not isinstance(arr, np.ndarray) and set(map(type, arr)) != {float}:
+        return None
+    return a
+
+
+def _like_input(result, arr):
+    # ndarray на входе — ndarray на выходе, без возврата к спискам Python
+    if isinstance(arr, np.ndarray):
+        return result
+    return result.tolist()
+
+
+def _counting_sort_numpy(a):
+    if a.size == 0:
+        return a.copy()
+    lo = a.min()
+    hi = a.max()
+    if not _counting_span_ok(int(hi) - int(lo) + 1, a.size):
+        values, counts = np.unique(a, return_counts=True)
+        return np.repeat(values, counts)
+    # Смещения считаем в 64-битном типе и int Python: в узких типах (int8, int16) a - lo и hi + 1 переполняются.
+    # Диапазон уже ограничен _counting_span_ok, поэтому смещения и сами значения в этом типе помещаются
+    lo, hi = int(lo), int(hi)
+    wide = np.uint64 if a.dtype.kind == "u" else np.int64
+    offsets = a.astype(wide) - wide(lo)
+    counts = np.bincount(offsets.astype(np.intp), minlength=hi - lo + 1)
+    values = np.arange(hi - lo + 1, dtype=wide) + wide(lo)
+    return np.repeat(values.astype(a.dtype), counts)
+
+
+def _radix_sort_numpy(a):
+    if a.size == 0:
+        return a.copy()
+    # Побайтовая LSD по uint64: у знаковых инвертируем знаковый бит, чтобы отрицательные шли первыми.
+    # Беззнаковые берутся как есть — через int64 значения от 2**63 стали бы отрицательными
+    if a.dtype.kind == "u":
+        flip = np.uint64(0)
+        keys = a.astype(np.uint64)
+    else:
+        flip = np.uint64(1 << 63)
+        keys = a.astype(np.int64).view(np.uint64) ^ flip
+    for shift in range(0, 64, 8):
+        digit = ((keys >> np.uint64(shift)) & np.uint64(0xFF)).astype(np.uint8)
+        if digit.min() == digit.max():
+            continue
+        keys = keys[np.argsort(digit, kind="stable")]
+    if a.dtype.kind == "u":
+        return keys.astype(a.dtype)
+    return (keys ^ flip).view(np.int64).astype(a.dtype)
+
+
+def _bucket_sort_numpy(a):
+    if a.size == 0:
+        return a.copy()
+    lo = a.min()
+    hi = a.max()
+    if lo == hi:
+        return a.copy()
+    # None — векторно не получится, сортирует версия на Python
+    if a.dtype.kind == "u" and a.dtype.itemsize == 8:
+        # uint64 в float64 теряет младшие биты, номера корзин перестают быть точными
+        return None
+    if a.dtype.kind == "i" and int(hi) - int(lo) > np.iinfo(a.dtype).max:
+        # a - lo переполнится и даст неверные корзины
+        return None
+    bucket_count = max(1, a.size // BUCKET_SIZE)
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        scale = bucket_count / (hi - lo)
+        if not np.isfinite(scale) or scale <= 0:
+            return None
+        idx = ((a - lo) * scale).astype(np.intp)
+    np.minimum(idx, bucket_count - 1, out=idx)
+    # Сначала по номеру корзины, внутри корзины — по значению
+    return a[np.lexsort((a, idx))]
+
+
+def insertion_sort(arr):
+    a = list(arr)
+    _insertion_sort_range(a, 0, len(a) - 1)
+    return a
+
+
+def _insertion_sort_range(a, lo, hi):
+    for i in range(lo + 1, hi + 1):
+        x = a[i]
+        j = i - 1
+        while j >= lo and a[j] > x:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = x
+
+
+def _heap_sort_range(a, lo, hi):
+    size = hi - lo + 1
+
+    def sift(root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end and a[lo + child + 1] > a[lo + child]:
+                child += 1
+            if a[lo + root] >= a[lo + child]:
+                return
+            a[lo + root], a[lo + child] = a[lo + child], a[lo + root]
+            root = child
+
+    for i in range(size // 2 - 1, -1, -1):
+        sift(i, size)
+    for end in range(size - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        sift(0, end)
+
+
+def _median_of_three(a, i, j, k):
+    if a[i] < a[j]:
+        if a[j] < a[k]:
+            return j
+        return k if a[i] < a[k] else i
+    if a[i] < a[k]:
+        return i
+    return k if a[j] < a[k] else j
+
+
+SMALL_SORT = 16
+
+def intro_sort(arr):
+    a = list(arr)
+    if len(a) > 1:
+        _intro_sort_range(a, 0, len(a) - 1, 2 * len(a).bit_length())
+    return a
+
+
+def _intro_sort_range(a, lo, hi, depth):
+    while hi - lo + 1 > SMALL_SORT:
+        # Слишком глубокая рекурсия — вход плохой для quicksort, переходим на кучу
+        if depth == 0:
+            _heap_sort_range(a, lo, hi)
+            return
+        depth -= 1
+        m = _median_of_three(a, lo, (lo + hi) // 2, hi)
+        pivot = a[m]
+        i, j = lo, hi
+        while i <= j:
+            while a[i] < pivot:
+                i += 1
+            while a[j] > pivot:
+                j -= 1
+            if i <= j:
+                a[i], a[j] = a[j], a[i]
+                i += 1
+                j -= 1
+        # Рекурсия в меньшую половину, цикл по большей
+        if j - lo < hi - i:
+            _intro_sort_range(a, lo, j, depth)
+            lo = i
+        else:
+            _intro_sort_range(a, i, hi, depth)
+            hi = j
+    _insertion_sort_range(a, lo, hi)
+
+
+NINTHER_THRESHOLD = 40
+
+def _choose_pivot(a, lo, hi):
+    mid = (lo + hi) // 2
+    if hi - lo + 1 <= NINTHER_THRESHOLD:
+        return _median_of_three(a, lo, mid, hi)
+    # Ninther (медиана медиан из трёх троек) для больших диапазонов
+    step = (hi - lo + 1) // 8
+    m1 = _median_of_three(a, lo, lo + step, lo + 2 * step)
+    m2 = _median_of_three(a, mid - step, mid, mid + step)
+    m3 = _median_of_three(a, hi - 2 * step, hi - step, hi)
+    return _median_of_three(a, m1, m2, m3)
+
+
+def quick_sort_inplace(arr):
+    a = list(arr)
+    stack = [(0, len(a) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        while hi - lo + 1 > SMALL_SORT:
+            pivot = a[_choose_pivot(a, lo, hi)]
+            # Трёхпутевое разбиение (флаг Дейкстры):
+            # a[lo:lt] < pivot, a[lt:i] == pivot, a[gt+1:hi+1] > pivot
+            lt, i, gt = lo, lo, hi
+            while i <= gt:
+                x = a[i]
+                if x < pivot:
+                    a[i] = a[lt]
+                    a[lt] = x
+                    lt += 1
+                    i += 1
+                elif x > pivot:
+                    a[i] = a[gt]
+                    a[gt] = x
+                    gt -= 1
+                else:
+                    i += 1
+            # Меньшая часть обрабатывается сразу, большая ждёт в стеке — стек O(log n)
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1))
+                lo = gt + 1
+        _insertion_sort_range(a, lo, hi)
+    return a
+
+
+# Выбор сортировки по входным данным
+COUNTING_RANGE_FACTOR = 16
+DUPLICATE_RATIO = 0.5
+PROFILE_SAMPLE = 1024
+
+def profile_array(arr):
+    n = len(arr)
+    if n == 0:
+        return {"n": 0, "all_int": True, "min": None, "max": None,
+                "ascents": 0, "descents": 0, "distinct_ratio": 1.0}
+    # Один проход на каждую характеристику, но все циклы внутри встроенных функций
+    tail = arr[1:]
+    descents = sum(map(operator.lt, tail, arr))
+    ascents = sum(map(operator.gt, tail, arr))
+    all_int = all(type(x) is int for x in arr)
+    step = max(1, n // PROFILE_SAMPLE)
+    sample = arr[::step]
+    return {
+        "n": n,
+        "all_int": all_int,
+        "min": min(arr),
+        "max": max(arr),
+        "ascents": ascents,
+        "descents": descents,
+        "distinct_ratio": len(set(sample)) / len(sample),
+    }
+
+
+def choose_sort(arr):
+    if len(arr) <= SMALL_SORT:
+        return "insertion"
+    p = profile_array(arr)
+    if p["descents"] == 0:
+        return "sorted"
+    if p["ascents"] == 0:
+        return "reversed"
+    if p["all_int"]:
+        if p["max"] - p["min"] + 1 <= COUNTING_RANGE_FACTOR * p["n"]:
+            return "counting"
+        if p["distinct_ratio"] < DUPLICATE_RATIO:
+            return "quick"
+        return "radix"
+    return "intro"
+
+
+def sort(arr):
+    kind = choose_sort(arr)
+    if kind == "insertion":
+        return insertion_sort(arr)
+    if kind == "sorted":
+        return list(arr)
+    if kind == "reversed":
+        return list(reversed(arr))
+    if kind == "counting":
+        return counting_sort(arr)
+    if kind == "quick":
+        return quick_sort_inplace(arr)
+    if kind == "radix":
+        return radix_sort_lsd(arr)
+    return intro_sort(arr)
+
+# Параллельная сортировка
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+PARALLEL_THRESHOLD = 100000
+
+def parallel_sort(arr, workers=None, kernel=None, min_size=PARALLEL_THRESHOLD):
+    if kernel is None:
+        kernel = sort
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    n = len(arr)
+    if workers == 1 or n < max(min_size, 2 * workers):
+        return kernel(list(arr))
+
+    bounds = [(i * n // workers, (i + 1) * n // workers) for i in range(workers)]
+    typecode = _shared_typecode(arr)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if typecode is None:
+            # Смешанные типы или большие числа — чанки передаются через pickle
+            runs = list(pool.map(kernel, [list(arr[lo:hi]) for lo, hi in bounds]))
+        else:
+            runs = _parallel_sort_shared(pool, arr, typecode, bounds, kernel)
+    # k-путевое слияние отсортированных кусков через кучу
+    return list(heapq.merge(*runs))
+
+
+def _shared_typecode(arr):
+    if all(type(x) is float for x in arr):
+        return "d"
+    if all(type(x) is int for x in arr):
+        try:
+            array("q", [min(arr), max(arr)])
+        except OverflowError:
+            return None
+        return "q"
+    return None
+
+
+def _parallel_sort_shared(pool, arr, typecode, bounds, kernel):
+    # Данные лежат в общей памяти: процессы получают только имя блока и границы своего куска
+    # memoryview того же формата (например, из DatasetCache) копируется в блок напрямую, без промежуточного array
+    data = arr if isinstance(arr, memoryview) and arr.format == typecode else array(typecode, arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data) * data.itemsize))
+    view = shm.buf.cast(typecode)
+    try:
+        view[:len(data)] = data
+        list(pool.map(
+            _sort_shared_chunk,
+            [shm.name] * len(bounds), [typecode] * len(bounds),
+            [lo for lo, _ in bounds], [hi for _, hi in bounds], [kernel] * len(bounds),
+        ))
+        runs = [view[lo:hi].tolist() for lo, hi in bounds]
+    finally:
+        view.release()
+        shm.close()
+        shm.unlink()
+    return runs
+
+
+def _sort_shared_chunk(name, typecode, lo, hi, kernel):
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        view[lo:hi] = array(typecode, kernel(view[lo:hi].tolist()))
+    finally:
+        view.release()
+        shm.close()
+
+
+# Внешняя сортировка (данные больше памяти)
+import tempfile
+
+EXTERNAL_MEMORY = 64 * 1024 * 1024  # байт на один отсортированный кусок в памяти
+EXTERNAL_ITEM_BYTES = 80            # примерная цена одного числа в списке Python вместе с копией сортировки
+EXTERNAL_MAX_FANIN = 64             # сколько файлов сливать за раз
+
+def read_numbers(source, typecode="q"):
+    parse = float if typecode == "d" else int
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8") as f:
+            for line in f:
+                for token in line.split():
+                    yield parse(token)
+    else:
+        for x in source:
+            yield parse(x)
+
+
+def iter_external_sort(source, memory_limit=EXTERNAL_MEMORY, kernel=None, typecode="q", tmp_dir=None):
+    if typecode not in ("q", "d"):
+        raise ValueError("typecode must be 'q' or 'd'")
+    if kernel is None:
+        kernel = sort
+    run_size = max(1, memory_limit // EXTERNAL_ITEM_BYTES)
+    numbers = read_numbers(source, typecode)
+    first = list(islice(numbers, run_size))
+    rest = list(islice(numbers, 1))
+    if not rest:
+        # Всё поместилось в один кусок — временные файлы не нужны
+        yield from kernel(first)
+        return
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as workdir:
+        runs = []
+        run = first
+        while run:
+            runs.append(_spill_run(kernel(run), typecode, workdir))
+            run = rest + list(islice(numbers, run_size - len(rest)))
+            rest = []
+        while len(runs) > EXTERNAL_MAX_FANIN:
+            runs = [
+                _merge_to_file(runs[i:i + EXTERNAL_MAX_FANIN], typecode, workdir, memory_limit)
+                for i in range(0, len(runs), EXTERNAL_MAX_FANIN)
+            ]
+        yield from _merge_runs(runs, typecode, memory_limit)
+
+
+def external_sort(source, output, memory_limit=EXTERNAL_MEMORY, kernel=None, typecode="q", tmp_dir=None):
+    values = iter_external_sort(source, memory_limit, kernel, typecode, tmp_dir)
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, "w", encoding="utf-8") as f:
+            return write_numbers(values, f)
+    return write_numbers(values, output)
+
+
+def write_numbers(values, f, batch=4096):
+    count = 0
+    while True:
+        chunk = list(islice(values, batch))
+        if not chunk:
+            return count
+        f.write("\n".join(map(str, chunk)))
+        f.write("\n")
+        count += len(chunk)
+
+
+def _spill_run(values, typecode, workdir):
+    fd, path = tempfile.mkstemp(suffix=".bin", dir=workdir)
+    with os.fdopen(fd, "wb") as f:
+        array(typecode, values).tofile(f)
+    return path
+
+
+def _read_run(path, typecode, buffer_items):
+    with open(path, "rb") as f:
+        while True:
+            chunk = array(typecode)
+            try:
+                chunk.fromfile(f, buffer_items)
+            except EOFError:
+                pass  # прочитанные до конца файла элементы всё равно попали в chunk
+            if not chunk:
+                break
+            yield from chunk
+    os.remove(path)
+
+
+def _merge_runs(runs, typecode, memory_limit):
+    itemsize = array(typecode).itemsize
+    buffer_items = max(1024, memory_limit // (2 * len(runs) * itemsize))
+    return heapq.merge(*(_read_run(path, typecode, buffer_items) for path in runs))
+
+
+def _merge_to_file(runs, typecode, workdir, memory_limit):
+    merged = _merge_runs(runs, typecode, memory_limit)
+    fd, path = tempfile.mkstemp(suffix=".bin", dir=workdir)
+    with os.fdopen(fd, "wb") as f:
+        while True:
+            chunk = array(typecode, islice(merged, 65536))
+            if not chunk:
+                break
+            chunk.tofile(f)
+    return path
+
+
 # Стек
 class Stack:
     def __init__(self):
@@ -217,42 +1080,599 @@ class Queue:
         return len(self.items)
 
 
+
+# Очередь с min()/max() за O(1): рядом с элементами храним монотонные деки
+class MinMaxQueue(Queue):
+    def __init__(self):
+        super().__init__()
+        self.min_items = deque()
+        self.max_items = deque()
+    def enqueue(self, x):
+        super().enqueue(x)
+        while self.min_items and self.min_items[-1] > x:
+            self.min_items.pop()
+        self.min_items.append(x)
+        while self.max_items and self.max_items[-1] < x:
+            self.max_items.pop()
+        self.max_items.append(x)
+    def dequeue(self):
+        x = super().dequeue()
+        if x == self.min_items[0]:
+            self.min_items.popleft()
+        if x == self.max_items[0]:
+            self.max_items.popleft()
+        return x
+    def min(self):
+        if not self.min_items:
+            raise IndexError("min from empty queue")
+        return self.min_items[0]
+    def max(self):
+        if not self.max_items:
+            raise IndexError("max from empty queue")
+        return self.max_items[0]
+
+
+# Очередь на двух стеках для любой ассоциативной операции (сумма, НОД, min, ...)
+class AggregateQueue:
+    def __init__(self, op):
+        self.op = op
+        self.back = []   # (значение, свёртка back от начала до него)
+        self.out = []    # (значение, свёртка от него до дна out); вершина — самый старый элемент
+    def enqueue(self, x):
+        agg = self.op(self.back[-1][1], x) if self.back else x
+        self.back.append((x, agg))
+    def dequeue(self):
+        if not self.out:
+            if not self.back:
+                raise IndexError("dequeue from empty queue")
+            # Перекладываем back в out: каждый элемент переезжает один раз — амортизированно O(1)
+            while self.back:
+                x, _ = self.back.pop()
+                agg = self.op(x, self.out[-1][1]) if self.out else x
+                self.out.append((x, agg))
+        return self.out.pop()[0]
+    def front(self):
+        if self.out:
+            return self.out[-1][0]
+        if self.back:
+            return self.back[0][0]
+        raise IndexError("front from empty queue")
+    def aggregate(self):
+        if self.out and self.back:
+            return self.op(self.out[-1][1], self.back[-1][1])
+        if self.out:
+            return self.out[-1][1]
+        if self.back:
+            return self.back[-1][1]
+        raise IndexError("aggregate from empty queue")
+    def is_empty(self):
+        return not self.out and not self.back
+    def __len__(self):
+        return len(self.out) + len(self.back)
+
+
+def sliding_window(iterable, k, agg=min):
+    if k < 1:
+        raise ValueError("k must be >= 1")
+    if agg is min or agg is max:
+        q = MinMaxQueue()
+        result = q.min if agg is min else q.max
+    else:
+        q = AggregateQueue(agg)
+        result = q.aggregate
+    for x in iterable:
+        q.enqueue(x)
+        if len(q) > k:
+            q.dequeue()
+        if len(q) == k:
+            yield result()
+
+
+# Потокобезопасные и asyncio-версии стека и очереди
+import asyncio
+import threading
+from queue import Empty, Full
+
+class ThreadSafeQueue:
+    # Один замок и два условия, как в queue.Queue; maxsize=0 — без ограничения
+    def __init__(self, maxsize=0):
+        self.items = deque()
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+    def _full(self):
+        return 0 < self.maxsize <= len(self.items)
+    def enqueue(self, x, block=True, timeout=None):
+        with self.not_full:
+            if self._full():
+                if not block or not self.not_full.wait_for(lambda: not self._full(), timeout):
+                    raise Full
+            self.items.append(x)
+            self.not_empty.notify()
+    def dequeue(self, block=True, timeout=None):
+        with self.not_empty:
+            if not self.items:
+                if not block or not self.not_empty.wait_for(lambda: self.items, timeout):
+                    raise Empty
+            x = self.items.popleft()
+            self.not_full.notify()
+            return x
+    put = enqueue
+    get = dequeue
+    def front(self):
+        with self.lock:
+            if not self.items:
+                raise IndexError("front from empty queue")
+            return self.items[0]
+    def is_empty(self):
+        return len(self.items) == 0
+    def __len__(self):
+        return len(self.items)
+
+
+class ThreadSafeStack:
+    def __init__(self, maxsize=0):
+        self.items = []
+        self.min_stack = []
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+    def _full(self):
+        return 0 < self.maxsize <= len(self.items)
+    def push(self, x, block=True, timeout=None):
+        with self.not_full:
+            if self._full():
+                if not block or not self.not_full.wait_for(lambda: not self._full(), timeout):
+                    raise Full
+            self.items.append(x)
+            if not self.min_stack or x <= self.min_stack[-1]:
+                self.min_stack.append(x)
+            self.not_empty.notify()
+    def pop(self, block=True, timeout=None):
+        with self.not_empty:
+            if not self.items:
+                if not block or not self.not_empty.wait_for(lambda: self.items, timeout):
+                    raise Empty
+            x = self.items.pop()
+            if x == self.min_stack[-1]:
+                self.min_stack.pop()
+            self.not_full.notify()
+            return x
+    def peek(self):
+        with self.lock:
+            if not self.items:
+                raise IndexError("peek from empty stack")
+            return self.items[-1]
+    def min(self):
+        with self.lock:
+            if not self.min_stack:
+                raise IndexError("min from empty stack")
+            return self.min_stack[-1]
+    def is_empty(self):
+        return len(self.items) == 0
+    def __len__(self):
+        return len(self.items)
+
+
+class _AsyncContainer:
+    # Общая часть AsyncQueue и AsyncStack: различаются только тем, с какого конца берут элемент.
+    # В asyncio код между await выполняется атомарно, поэтому замок не нужен —
+    # ждущие корутины просто стоят в очереди future и будятся по одной.
+    # Условие проверяется и элемент берётся в одной задаче без await между ними: wait_for вокруг
+    # всего ожидания запускал бы его отдельной задачей, и между проверкой и take успевал бы вклиниться другой
+    def __init__(self, maxsize=0):
+        self.items = deque()
+        self.maxsize = maxsize
+        self._getters = deque()
+        self._putters = deque()
+    def _full(self):
+        return 0 < self.maxsize <= len(self.items)
+    def _wake(self, waiters):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+    async def _wait(self, waiters, ready, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not ready():
+            waiter = loop.create_future()
+            waiters.append(waiter)
+            try:
+                if deadline is None:
+                    await waiter
+                else:
+                    await asyncio.wait_for(waiter, deadline - loop.time())
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                waiter.cancel()
+                if waiter.done() and not waiter.cancelled():
+                    # Нас уже разбудили, но мы уходим — передаём пробуждение следующему
+                    self._wake(waiters)
+                raise
+    async def _add(self, x, timeout):
+        try:
+            await self._wait(self._putters, lambda: not self._full(), timeout)
+        except asyncio.TimeoutError:
+            raise Full from None
+        self.items.append(x)
+        self._wake(self._getters)
+    async def _take(self, take, timeout):
+        try:
+            await self._wait(self._getters, lambda: self.items, timeout)
+        except asyncio.TimeoutError:
+            raise Empty from None
+        x = take()
+        self._wake(self._putters)
+        return x
+    def is_empty(self):
+        return len(self.items) == 0
+    def __len__(self):
+        return len(self.items)
+
+
+class AsyncQueue(_AsyncContainer):
+    async def enqueue(self, x, timeout=None):
+        await self._add(x, timeout)
+    async def dequeue(self, timeout=None):
+        return await self._take(self.items.popleft, timeout)
+    put = enqueue
+    get = dequeue
+
+
+class AsyncStack(_AsyncContainer):
+    async def push(self, x, timeout=None):
+        await self._add(x, timeout)
+    async def pop(self, timeout=None):
+        return await self._take(self.items.pop, timeout)
+
+
+# Типизированные стек и очередь на array.array: 8 байт на int64 вместо объекта + указателя
+class TypedStack:
+    __slots__ = ("items", "min_stack")
+
+    def __init__(self, typecode="q"):
+        self.items = array(typecode)
+        self.min_stack = array(typecode)
+    def push(self, x):
+        self.items.append(x)
+        if not self.min_stack or x <= self.min_stack[-1]:
+            self.min_stack.append(x)
+    def push_many(self, values):
+        values = array(self.items.typecode, values)
+        if not values:
+            return
+        self.items.extend(values)
+        mins = self.min_stack
+        current = mins[-1] if mins else values[0]
+        new_mins = []
+        for x in values:
+            if x <= current:
+                current = x
+                new_mins.append(x)
+        mins.extend(array(mins.typecode, new_mins))
+    def pop(self):
+        if not self.items:
+            raise IndexError("pop from empty stack")
+        x = self.items.pop()
+        if x == self.min_stack[-1]:
+            self.min_stack.pop()
+        return x
+    def pop_many(self, k):
+        if k < 0 or k > len(self.items):
+            raise IndexError("pop_many out of range")
+        if k == 0:
+            return []
+        tail = self.items[-k:]
+        del self.items[-k:]
+        tail.reverse()
+        mins = self.min_stack
+        for x in tail:
+            if x == mins[-1]:
+                mins.pop()
+        return tail.tolist()
+    def peek(self):
+        if not self.items:
+            raise IndexError("peek from empty stack")
+        return self.items[-1]
+    def is_empty(self):
+        return len(self.items) == 0
+    def __len__(self):
+        return len(self.items)
+    def min(self):
+        if not self.min_stack:
+            raise IndexError("min from empty stack")
+        return self.min_stack[-1]
+
+
+class TypedQueue:
+    # Кольцевой буфер: head — индекс первого элемента, size — число элементов
+    __slots__ = ("buf", "head", "size")
+
+    def __init__(self, typecode="q", capacity=16):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.buf = array(typecode, [0]) * capacity
+        self.head = 0
+        self.size = 0
+    def _ordered(self):
+        cap = len(self.buf)
+        end = self.head + self.size
+        if end <= cap:
+            return self.buf[self.head:end]
+        return self.buf[self.head:] + self.buf[:end - cap]
+    def _reserve(self, need):
+        cap = len(self.buf)
+        if need <= cap:
+            return
+        new_buf = array(self.buf.typecode, [0]) * max(2 * cap, need)
+        new_buf[:self.size] = self._ordered()
+        self.buf = new_buf
+        self.head = 0
+    def enqueue(self, x):
+        self._reserve(self.size + 1)
+        self.buf[(self.head + self.size) % len(self.buf)] = x
+        self.size += 1
+    def enqueue_many(self, values):
+        values = array(self.buf.typecode, values)
+        self._reserve(self.size + len(values))
+        cap = len(self.buf)
+        start = (self.head + self.size) % cap
+        first = min(len(values), cap - start)
+        self.buf[start:start + first] = values[:first]
+        self.buf[:len(values) - first] = values[first:]
+        self.size += len(values)
+    def dequeue(self):
+        if not self.size:
+            raise IndexError("dequeue from empty queue")
+        x = self.buf[self.head]
+        self.head = (self.head + 1) % len(self.buf)
+        self.size -= 1
+        return x
+    def dequeue_many(self, k):
+        if k < 0 or k > self.size:
+            raise IndexError("dequeue_many out of range")
+        cap = len(self.buf)
+        end = self.head + k
+        if end <= cap:
+            out = self.buf[self.head:end]
+        else:
+            out = self.buf[self.head:] + self.buf[:end - cap]
+        self.head = end % cap
+        self.size -= k
+        return out.tolist()
+    def front(self):
+        if not self.size:
+            raise IndexError("front from empty queue")
+        return self.buf[self.head]
+    def is_empty(self):
+        return self.size == 0
+    def __len__(self):
+        return self.size
+
+
 # Генераторы
+# У каждого вызова свой random.Random(seed): глобальное состояние random не трогаем
 import random
 def rand_int_array(n, lo, hi, seed=None):
-    if seed is not None:
-        random.seed(seed)
-    return [random.randint(lo, hi) for _ in range(n)]
+    rng = random.Random(seed)
+    return [rng.randint(lo, hi) for _ in range(n)]
 
 def nearly_sorted(n, swaps, seed=None):
-    if seed is not None:
-        random.seed(seed)
+    rng = random.Random(seed)
     arr = list(range(n))
+    if n < 2:
+        return arr
     for _ in range(swaps):
-        i = random.randint(0, n - 1)
-        j = random.randint(0, n - 1)
+        i = rng.randint(0, n - 1)
+        j = rng.randint(0, n - 1)
         arr[i], arr[j] = arr[j], arr[i]
     return arr
 
 def many_duplicates(n, k=5, seed=None):
-    if seed is not None:
-        random.seed(seed)
-    return [random.randint(0, k - 1) for _ in range(n)]
+    rng = random.Random(seed)
+    return [rng.randint(0, k - 1) for _ in range(n)]
 
 def reverse_sorted(n):
     return list(range(n - 1, -1, -1))
 
 def rand_float_array(n, seed=None):
-    if seed is not None:
-        random.seed(seed)
-    return [random.random() for _ in range(n)]
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(n)]
+
+def skewed_float_array(n, power=8, seed=None):
+    # Большинство значений прижато к нулю — на таких данных фиксированные корзины вырождаются
+    rng = random.Random(seed)
+    return [rng.random() ** power for _ in range(n)]
+
+def zipf_array(n, s=1.2, k=1000, seed=None):
+    # Значения 1..k, P(i) ~ 1 / i^s: несколько очень частых значений и длинный хвост
+    return make_array("zipf", n, seed=seed, s=s, k=k)
+
+def sawtooth(n, period=100):
+    return [i % period for i in range(n)]
+
+def organ_pipe(n):
+    # 0, 1, ..., середина, ..., 1, 0
+    return [min(i, n - 1 - i) for i in range(n)]
+
+def all_equal(n, value=0):
+    return [value] * n
+
+def sorted_runs(n, runs=10, seed=None):
+    return make_array("sorted_runs", n, seed=seed, runs=runs)
+
+
+# Потоковые генераторы: массив отдаётся кусками, в памяти только текущий кусок
+CHUNK_SIZE = 1 << 16
+
+def _uniform_ints(rng, count, lo, hi):
+    # Один вызов getrandbits на весь кусок вместо randint на каждый элемент
+    span = hi - lo + 1
+    if count == 0:
+        return []
+    if span > 1 << 32:
+        return [rng.randint(lo, hi) for _ in range(count)]
+    raw = array("Q")
+    raw.frombytes(rng.getrandbits(64 * count).to_bytes(8 * count, "little"))
+    return [lo + x % span for x in raw]
+
+
+def _chunk_bounds(n, chunk_size):
+    for start in range(0, n, chunk_size):
+        yield start, min(n, start + chunk_size)
+
+
+def _stream_random(n, rng, chunk_size, lo=0, hi=None):
+    if hi is None:
+        hi = 10 * n
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield _uniform_ints(rng, stop - start, lo, hi)
+
+
+def _stream_nearly(n, rng, chunk_size, swaps=None):
+    # Перестановки делаются внутри куска, их число пропорционально размеру куска
+    if swaps is None:
+        swaps = max(1, n // 20)
+    for start, stop in _chunk_bounds(n, chunk_size):
+        chunk = list(range(start, stop))
+        size = stop - start
+        for _ in range(swaps * size // n):
+            i = rng.randrange(size)
+            j = rng.randrange(size)
+            chunk[i], chunk[j] = chunk[j], chunk[i]
+        yield chunk
+
+
+def _stream_duplicates(n, rng, chunk_size, k=5):
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield _uniform_ints(rng, stop - start, 0, k - 1)
+
+
+def _stream_reverse(n, rng, chunk_size):
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield list(range(n - 1 - start, n - 1 - stop, -1))
+
+
+def _stream_float(n, rng, chunk_size):
+    rand = rng.random
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield [rand() for _ in range(stop - start)]
+
+
+def _stream_zipf(n, rng, chunk_size, s=1.2, k=1000):
+    weights = list(accumulate(1 / i ** s for i in range(1, k + 1)))
+    values = range(1, k + 1)
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield rng.choices(values, cum_weights=weights, k=stop - start)
+
+
+def _stream_sawtooth(n, rng, chunk_size, period=100):
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield [i % period for i in range(start, stop)]
+
+
+def _stream_organ_pipe(n, rng, chunk_size):
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield [min(i, n - 1 - i) for i in range(start, stop)]
+
+
+def _stream_all_equal(n, rng, chunk_size, value=0):
+    for start, stop in _chunk_bounds(n, chunk_size):
+        yield [value] * (stop - start)
+
+
+def _stream_sorted_runs(n, rng, chunk_size, runs=10):
+    # runs отсортированных по возрастанию кусков случайных чисел подряд
+    runs = max(1, min(runs, n))
+    for r in range(runs):
+        run = _uniform_ints(rng, (r + 1) * n // runs - r * n // runs, 0, 10 * n)
+        run.sort()
+        for start, stop in _chunk_bounds(len(run), chunk_size):
+            yield run[start:stop]
+
+
+STREAMS = {
+    "random":      _stream_random,
+    "nearly":      _stream_nearly,
+    "duplicates":  _stream_duplicates,
+    "reverse":     _stream_reverse,
+    "float":       _stream_float,
+    "zipf":        _stream_zipf,
+    "sawtooth":    _stream_sawtooth,
+    "organ_pipe":  _stream_organ_pipe,
+    "all_equal":   _stream_all_equal,
+    "sorted_runs": _stream_sorted_runs,
+}
+
+FLOAT_STREAMS = {"float"}
+
+
+def stream_array(kind, n, seed=None, chunk_size=CHUNK_SIZE, **params):
+    if kind not in STREAMS:
+        raise ValueError(f"unknown generator: {kind}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    return STREAMS[kind](n, random.Random(seed), chunk_size, **params)
+
+
+def make_array(kind, n, seed=None, out="list", **params):
+    if out == "numpy":
+        if np is None:
+            raise ImportError("numpy is not installed")
+        if kind in NUMPY_STREAMS:
+            return NUMPY_STREAMS[kind](n, np.random.default_rng(seed), **params)
+        return np.fromiter(chain.from_iterable(stream_array(kind, n, seed, **params)),
+                           dtype=np.float64 if kind in FLOAT_STREAMS else np.int64, count=n)
+    chunks = stream_array(kind, n, seed, **params)
+    if out == "array":
+        result = array("d" if kind in FLOAT_STREAMS else "q")
+        for chunk in chunks:
+            result.extend(chunk)
+        return result
+    if out == "list":
+        return list(chain.from_iterable(chunks))
+    raise ValueError(f"unknown output: {out}")
+
+
+def _np_random(n, rng, lo=0, hi=None):
+    return rng.integers(lo, (10 * n if hi is None else hi) + 1, size=n, dtype=np.int64)
+
+
+def _np_duplicates(n, rng, k=5):
+    return rng.integers(0, k, size=n, dtype=np.int64)
+
+
+def _np_zipf(n, rng, s=1.2, k=1000):
+    weights = 1 / np.arange(1, k + 1, dtype=np.float64) ** s
+    return rng.choice(np.arange(1, k + 1, dtype=np.int64), size=n, p=weights / weights.sum())
+
+
+NUMPY_STREAMS = {
+    "random":     _np_random,
+    "duplicates": _np_duplicates,
+    "reverse":    lambda n, rng: np.arange(n - 1, -1, -1, dtype=np.int64),
+    "float":      lambda n, rng: rng.random(n),
+    "zipf":       _np_zipf,
+    "sawtooth":   lambda n, rng, period=100: np.arange(n, dtype=np.int64) % period,
+    "organ_pipe": lambda n, rng: np.minimum(np.arange(n, dtype=np.int64), np.arange(n - 1, -1, -1, dtype=np.int64)),
+    "all_equal":  lambda n, rng, value=0: np.full(n, value, dtype=np.int64),
+}
 
 # Бенчмарк
 import time
-def timeit(func, arr):
-    start = time.time()
-    func(arr)
-    return time.time() - start
+def timeit(func, arr, repeat=3):
+    # Медиана из нескольких прогонов, каждый на свежей копии массива
+    samples = []
+    for _ in range(repeat):
+        data = list(arr)
+        start = time.perf_counter_ns()
+        func(data)
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    return samples[len(samples) // 2] / 1e9
 
 def benchmark(arrays, algos):
     results = {}
@@ -0,0 +1,755 @@
+import asyncio
+import csv
+import gc
+import hashlib
+import queue
+import threading
+import json
+import math
+import mmap
+import os
+import tempfile
+import time
+import tracemalloc
+from array import array
+from functools import partial
+
+from src.algorithms import (
+    factorial, factorial_fast, fibo, fibo_fast, fibo_mod, factorial_memo, fibo_memo,
+    bubble_sort, quick_sort, heap_sort, counting_sort, radix_sort, bucket_sort,
+    insertion_sort, intro_sort, quick_sort_inplace, radix_sort_lsd, sort, np,
+    parallel_sort, Stack, Queue, TypedStack, TypedQueue, ThreadSafeQueue, AsyncQueue,
+    rand_int_array, nearly_sorted, many_duplicates, reverse_sorted, rand_float_array,
+    skewed_float_array, zipf_array, sawtooth, organ_pipe, all_equal, sorted_runs, make_array,
+)
+
+# Все сортировки из algorithms.py
+ALGORITHMS = {
+    "bubble":   bubble_sort,
+    "quick":    quick_sort,
+    "quick_inplace": quick_sort_inplace,
+    "heap":     heap_sort,
+    "counting": counting_sort,
+    "radix":    radix_sort,
+    "radix_lsd": radix_sort_lsd,
+    "bucket":   bucket_sort,
+    "insertion": insertion_sort,
+    "intro":    intro_sort,
+    "sort":     sort,
+}
+
+# Сортировки, которые работают только с целыми числами
+INT_ONLY = {"counting", "radix", "radix_lsd"}
+
+if np is not None:
+    ALGORITHMS.update({
+        "counting_numpy": partial(counting_sort, backend="numpy"),
+        "radix_numpy":    partial(radix_sort, backend="numpy"),
+        "bucket_numpy":   partial(bucket_sort, backend="numpy"),
+    })
+    INT_ONLY |= {"counting_numpy", "radix_numpy"}
+
+# Генераторы: name -> (n, seed) -> массив
+GENERATORS = {
+    "random":     lambda n, seed: rand_int_array(n, 0, 10 * n, seed=seed),
+    "nearly":     lambda n, seed: nearly_sorted(n, max(1, n // 20), seed=seed),
+    "duplicates": lambda n, seed: many_duplicates(n, k=max(2, n // 10), seed=seed),
+    "reverse":    lambda n, seed: reverse_sorted(n),
+    "float":      lambda n, seed: rand_float_array(n, seed=seed),
+    "skewed":     lambda n, seed: skewed_float_array(n, seed=seed),
+    "zipf":       lambda n, seed: zipf_array(n, seed=seed),
+    "sawtooth":   lambda n, seed: sawtooth(n, period=max(2, n // 10)),
+    "organ_pipe": lambda n, seed: organ_pipe(n),
+    "all_equal":  lambda n, seed: all_equal(n),
+    "sorted_runs": lambda n, seed: sorted_runs(n, runs=max(1, n // 1000), seed=seed),
+}
+
+FLOAT_GENERATORS = {"float", "skewed"}
+
+FIELDS = ["algorithm", "generator", "n", "repeat", "min_ns", "median_ns", "p95_ns", "mean_ns", "stdev_ns"]
+
+
+def is_compatible(algo_name, gen_name):
+    return not (algo_name in INT_ONLY and gen_name in FLOAT_GENERATORS)
+
+
+def percentile(sorted_samples, q):
+    if not sorted_samples:
+        raise ValueError("no samples")
+    pos = (len(sorted_samples) - 1) * q
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    if lo == hi:
+        return sorted_samples[lo]
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+def summarize(samples):
+    s = sorted(samples)
+    n = len(s)
+    mean = sum(s) / n
+    var = sum((x - mean) ** 2 for x in s) / (n - 1) if n > 1 else 0.0
+    return {
+        "repeat": n,
+        "min_ns": s[0],
+        "median_ns": percentile(s, 0.5),
+        "p95_ns": percentile(s, 0.95),
+        "mean_ns": mean,
+        "stdev_ns": math.sqrt(var),
+    }
+
+
+def measure(func, arr, repeat=5, warmup=1, disable_gc=True):
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+    # Каждый прогон получает свою копию: in-place сортировки не должны видеть уже отсортированный вход
+    for _ in range(warmup):
+        func(list(arr))
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            data = list(arr)
+            if disable_gc:
+                gc.collect()
+                gc.disable()
+            start = time.perf_counter_ns()
+            func(data)
+            elapsed = time.perf_counter_ns() - start
+            if gc_was_enabled:
+                gc.enable()
+            samples.append(elapsed)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def run_suite(algos=None, generators=None, n=1000, seed=42, repeat=5, warmup=1, disable_gc=True, cache=None):
+    if algos is None:
+        algos = ALGORITHMS
+    if generators is None:
+        generators = GENERATORS
+    results = []
+    for gen_name, gen in generators.items():
+        arr = _dataset(cache, gen_name, gen, n, seed)
+        for algo_name, algo in algos.items():
+            if not is_compatible(algo_name, gen_name):
+                continue
+            samples = measure(algo, arr, repeat=repeat, warmup=warmup, disable_gc=disable_gc)
+            record = {"algorithm": algo_name, "generator": gen_name, "n": n}
+            record.update(summarize(samples))
+            results.append(record)
+    return results
+
+
+def write_json(results, path):
+    if not isinstance(path, (str, os.PathLike)):
+        json.dump(results, path, indent=2)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_csv(results, path):
+    if not isinstance(path, (str, os.PathLike)):
+        _write_csv_rows(results, path)
+        return
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        _write_csv_rows(results, f)
+
+
+def _write_csv_rows(results, f):
+    writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for record in results:
+        writer.writerow(record)
+
+
+def format_table(results):
+    lines = [f"{'algorithm':<16} {'generator':<11} {'n':>8} {'median ms':>11} {'p95 ms':>10} {'stdev ms':>10}"]
+    for r in results:
+        lines.append(
+            f"{r['algorithm']:<16} {r['generator']:<11} {r['n']:>8} "
+            f"{r['median_ns'] / 1e6:>11.4f} {r['p95_ns'] / 1e6:>10.4f} {r['stdev_ns'] / 1e6:>10.4f}"
+        )
+    return "\n".join(lines)
+
+
+# Кэш входных массивов на диске
+# Файл: 8 байт заголовка (магия + typecode) и сами числа в формате array; при повторном
+# использовании файл отображается через mmap, поэтому разные процессы делят одни страницы
+DATASET_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "datasets")
+DATASET_CACHE_MAX = 1 << 30
+DATASET_MAGIC = b"LAB3"
+DATASET_HEADER = 8
+
+
+class DatasetCache:
+    def __init__(self, path=DATASET_CACHE_DIR, max_bytes=DATASET_CACHE_MAX):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, generator, n, seed, params=None):
+        raw = json.dumps([generator, n, seed, params or {}], sort_keys=True)
+        return f"{generator}-{n}-{seed}-{hashlib.sha1(raw.encode()).hexdigest()[:12]}"
+
+    def file(self, generator, n, seed, params=None):
+        return os.path.join(self.path, self.key(generator, n, seed, params) + ".bin")
+
+    def load(self, generator, n, seed, params=None, make=None):
+        # Возвращает read-only memoryview над файлом; если массив не влезает в int64/float64 — обычный список
+        path = self.file(generator, n, seed, params)
+        try:
+            data = self._open(path)
+        except (FileNotFoundError, ValueError):
+            data = None
+        if data is not None:
+            self.hits += 1
+            os.utime(path)
+            return data
+        self.misses += 1
+        if make is None:
+            # Лямбды из GENERATORS принимают только (n, seed); параметры распределения понимает make_array
+            make = partial(make_array, generator) if params else GENERATORS[generator]
+        arr = make(n, seed, **(params or {}))
+        try:
+            packed = _pack(arr)
+        except OverflowError:
+            return arr
+        self._write(path, packed)
+        data = self._open(path)
+        self.evict()
+        return data
+
+    def _open(self, path):
+        with open(path, "rb") as f:
+            header = f.read(DATASET_HEADER)
+            if len(header) != DATASET_HEADER or header[:4] != DATASET_MAGIC:
+                raise ValueError(f"not a dataset file: {path}")
+            typecode = chr(header[4])
+            if os.fstat(f.fileno()).st_size == DATASET_HEADER:
+                return memoryview(array(typecode)).toreadonly()
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mm)[DATASET_HEADER:].cast(typecode)
+
+    def _write(self, path, packed):
+        # Пишем во временный файл и переименовываем: другой процесс не увидит недописанный файл
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(DATASET_MAGIC + packed.typecode.encode().ljust(4, b"\0"))
+                packed.tofile(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def entries(self):
+        # (время последнего использования, размер, путь) — от самых старых
+        result = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            result.append((st.st_mtime, st.st_size, path))
+        result.sort()
+        return result
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Уже удалён другим процессом или (в Windows) ещё отображён в память
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        return self.evict(0)
+
+
+def _pack(arr):
+    if isinstance(arr, array) and arr.typecode in "qd":
+        return arr
+    try:
+        return array("q", arr)
+    except TypeError:
+        return array("d", arr)
+
+
+def _dataset(cache, gen_name, gen, n, seed):
+    if cache is None:
+        return gen(n, seed)
+    return cache.load(gen_name, n, seed, make=gen)
+
+
+# Развёртка по размерам и подбор асимптотики
+
+# Максимальный n для каждой сортировки, чтобы квадратичные не работали часами
+SIZE_CAPS = {
+    "bubble":   3000,
+    "bucket":   10 ** 6,
+    "quick":    10 ** 6,
+    "quick_inplace": 10 ** 6,
+    "heap":     10 ** 6,
+    "counting": 10 ** 7,
+    "radix":    10 ** 6,
+    "radix_lsd": 10 ** 7,
+    "insertion": 3000,
+    "intro":    10 ** 6,
+    "sort":     10 ** 7,
+}
+
+MODELS = {
+    "O(n)":       lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n^2)":     lambda n: n * n,
+}
+
+
+def geometric_sizes(lo=100, hi=10 ** 7, per_decade=2):
+    if lo < 1 or hi < lo:
+        raise ValueError("need 1 <= lo <= hi")
+    sizes = []
+    k = 0
+    while True:
+        n = round(lo * 10 ** (k / per_decade))
+        if n > hi:
+            break
+        if not sizes or n != sizes[-1]:
+            sizes.append(n)
+        k += 1
+    return sizes
+
+
+def sweep(algos=None, generator="random", sizes=None, caps=None, seed=42, repeat=3, warmup=0, time_budget=2.0,
+          cache=None):
+    if algos is None:
+        algos = ALGORITHMS
+    if sizes is None:
+        sizes = geometric_sizes()
+    if caps is None:
+        caps = SIZE_CAPS
+    gen = GENERATORS[generator]
+    active = {name: algo for name, algo in algos.items() if is_compatible(name, generator)}
+    results = []
+    for n in sizes:
+        todo = {name: algo for name, algo in active.items() if n <= caps.get(name, n)}
+        if not todo:
+            break
+        arr = _dataset(cache, generator, gen, n, seed)
+        for name, algo in todo.items():
+            samples = measure(algo, arr, repeat=repeat, warmup=warmup)
+            record = {"algorithm": name, "generator": generator, "n": n}
+            record.update(summarize(samples))
+            results.append(record)
+            # Если один прогон уже дольше бюджета, бОльшие размеры не запускаем
+            if record["median_ns"] / 1e9 > time_budget:
+                del active[name]
+    return results
+
+
+def fit_complexity(points):
+    # Модель t = c * f(n), c подбирается по относительной ошибке (наименьшие квадраты для t/f)
+    points = [(n, t) for n, t in points if n > 1 and t > 0]
+    if len(points) < 2:
+        raise ValueError("need at least 2 points with n > 1")
+    fits = {}
+    for name, f in MODELS.items():
+        ratios = [f(n) / t for n, t in points]
+        c = sum(ratios) / sum(r * r for r in ratios)
+        err = math.sqrt(sum((c * r - 1) ** 2 for r in ratios) / len(ratios))
+        fits[name] = {"coef": c, "error": err}
+    best = min(fits, key=lambda name: fits[name]["error"])
+    return {"model": best, "coef": fits[best]["coef"], "fits": fits}
+
+
+def fit_sweep(results):
+    points = {}
+    for r in results:
+        points.setdefault(r["algorithm"], []).append((r["n"], r["median_ns"]))
+    return {name: fit_complexity(pts) for name, pts in points.items() if len(pts) >= 2}
+
+
+def predict(fit, n):
+    return fit["coef"] * MODELS[fit["model"]](n)
+
+
+def crossovers(fits, lo=2, hi=10 ** 9):
+    # Ищем n, где предсказанное время двух сортировок совпадает
+    grid = geometric_sizes(lo, hi, per_decade=20)
+    names = sorted(fits)
+    found = []
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            prev = None
+            for n in grid:
+                diff = predict(fits[a], n) - predict(fits[b], n)
+                sign = diff > 0
+                if prev is not None and sign != prev[1]:
+                    left, right = prev[0], n
+                    while right - left > 1:
+                        mid = (left + right) // 2
+                        if (predict(fits[a], mid) - predict(fits[b], mid) > 0) == prev[1]:
+                            left = mid
+                        else:
+                            right = mid
+                    faster_below = b if prev[1] else a
+                    faster_above = a if prev[1] else b
+                    found.append({"n": right, "below": faster_below, "above": faster_above})
+                prev = (n, sign)
+    found.sort(key=lambda c: c["n"])
+    return found
+
+
+# Масштабирование parallel_sort по числу процессов
+def parallel_scaling(n=10 ** 6, workers=(1, 2, 4), kernels=None, generator="random", seed=42, repeat=3,
+                     cache=None):
+    if kernels is None:
+        kernels = {"sort": sort, "quick_inplace": quick_sort_inplace}
+    arr = _dataset(cache, generator, GENERATORS[generator], n, seed)
+    results = []
+    for name, kernel in kernels.items():
+        # Последовательная версия — точка отсчёта для ускорения
+        base = summarize(measure(kernel, arr, repeat=repeat, warmup=0))
+        results.append({"algorithm": name, "generator": generator, "n": n, "workers": 0, "speedup": 1.0, **base})
+        for w in workers:
+            samples = measure(partial(parallel_sort, workers=w, kernel=kernel, min_size=0), arr, repeat=repeat, warmup=0)
+            stats = summarize(samples)
+            results.append({
+                "algorithm": f"parallel[{name}]", "generator": generator, "n": n, "workers": w,
+                "speedup": base["median_ns"] / stats["median_ns"], **stats,
+            })
+    return results
+
+
+# Факториал и Фибоначчи на больших n
+NUMERIC = {
+    "factorial":      factorial,
+    "factorial_fast": factorial_fast,
+    "fibo":           fibo,
+    "fibo_fast":      fibo_fast,
+    "fibo_mod":       partial(fibo_mod, m=10 ** 9 + 7),
+    "factorial_memo": factorial_memo,
+    "fibo_memo":      fibo_memo,
+}
+
+
+def run_numeric(funcs=None, ns=(1000, 10000, 100000), repeat=3, warmup=0):
+    if funcs is None:
+        funcs = NUMERIC
+    results = []
+    for n in ns:
+        for name, func in funcs.items():
+            samples = []
+            for _ in range(warmup):
+                func(n)
+            for _ in range(repeat):
+                start = time.perf_counter_ns()
+                func(n)
+                samples.append(time.perf_counter_ns() - start)
+            record = {"algorithm": name, "generator": "n", "n": n}
+            record.update(summarize(samples))
+            results.append(record)
+    return results
+
+
+# Стек и очередь: память и скорость
+def _fill_and_drain(make, n, bulk):
+    s = make()
+    if isinstance(s, (Stack, TypedStack)):
+        if bulk:
+            s.push_many(range(n))
+            s.pop_many(n)
+        else:
+            for x in range(n):
+                s.push(x)
+            for _ in range(n):
+                s.pop()
+    else:
+        if bulk:
+            s.enqueue_many(range(n))
+            s.dequeue_many(n)
+        else:
+            for x in range(n):
+                s.enqueue(x)
+            for _ in range(n):
+                s.dequeue()
+
+
+def _peak_bytes(make, n, bulk):
+    tracemalloc.start()
+    try:
+        s = make()
+        values = range(n)
+        if bulk:
+            (s.push_many if hasattr(s, "push_many") else s.enqueue_many)(values)
+        else:
+            add = s.push if hasattr(s, "push") else s.enqueue
+            for x in values:
+                add(x)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+STRUCTURES = {
+    "Stack":           (Stack, False),
+    "TypedStack":      (TypedStack, False),
+    "TypedStack bulk": (TypedStack, True),
+    "Queue":           (Queue, False),
+    "TypedQueue":      (TypedQueue, False),
+    "TypedQueue bulk": (TypedQueue, True),
+}
+
+
+def structure_benchmark(n=10 ** 6, repeat=3, structures=None):
+    if structures is None:
+        structures = STRUCTURES
+    results = []
+    for name, (make, bulk) in structures.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            _fill_and_drain(make, n, bulk)
+            samples.append(time.perf_counter_ns() - start)
+        record = {"algorithm": name, "generator": "range", "n": n}
+        record.update(summarize(samples))
+        record["peak_bytes"] = _peak_bytes(make, n, bulk)
+        results.append(record)
+    return results
+
+
+# Конкурентный доступ: producers кладут, consumers забирают
+def _thread_run(make_queue, producers, items):
+    q = make_queue()
+    per_producer = items // producers
+
+    def produce():
+        for x in range(per_producer):
+            q.put(x)
+
+    def consume():
+        while q.get() is not None:
+            pass
+
+    consumers = [threading.Thread(target=consume) for _ in range(producers)]
+    workers = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter_ns()
+    for t in consumers + workers:
+        t.start()
+    for t in workers:
+        t.join()
+    for _ in consumers:
+        q.put(None)
+    for t in consumers:
+        t.join()
+    return time.perf_counter_ns() - start
+
+
+def _async_run(make_queue, producers, items):
+    per_producer = items // producers
+
+    async def main():
+        q = make_queue()
+
+        async def produce():
+            for x in range(per_producer):
+                await q.put(x)
+
+        async def consume():
+            while await q.get() is not None:
+                pass
+
+        start = time.perf_counter_ns()
+        consumers = [asyncio.ensure_future(consume()) for _ in range(producers)]
+        await asyncio.gather(*(produce() for _ in range(producers)))
+        for _ in consumers:
+            await q.put(None)
+        await asyncio.gather(*consumers)
+        return time.perf_counter_ns() - start
+
+    return asyncio.run(main())
+
+
+CONCURRENT_QUEUES = {
+    "ThreadSafeQueue": (_thread_run, lambda: ThreadSafeQueue(maxsize=1024)),
+    "queue.Queue":     (_thread_run, lambda: queue.Queue(maxsize=1024)),
+    "AsyncQueue":      (_async_run, lambda: AsyncQueue(maxsize=1024)),
+    "asyncio.Queue":   (_async_run, lambda: asyncio.Queue(maxsize=1024)),
+}
+
+
+def contention_benchmark(items=100000, producers=(1, 2, 4), repeat=3, queues=None):
+    if queues is None:
+        queues = CONCURRENT_QUEUES
+    results = []
+    for p in producers:
+        for name, (run, make_queue) in queues.items():
+            samples = [run(make_queue, p, items) for _ in range(repeat)]
+            record = {"algorithm": name, "generator": f"{p}x{p}", "n": items}
+            record.update(summarize(samples))
+            results.append(record)
+    return results
+
+
+# Проверка корректности и регрессий производительности
+# Сортировки, которые обещают сохранять порядок равных элементов
+STABLE = {"bubble", "quick", "insertion"}
+
+PROPERTY_SIZES = (0, 1, 2, 3, 17, 100, 1000)
+PROPERTY_SEEDS = (0, 1, 2)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "baseline.json")
+BASELINE_TOLERANCE = 0.25
+# Разница меньше этой не считается регрессией: на коротких замерах шум больше 25%
+BASELINE_NOISE_NS = 50_000
+
+
+class _Tagged:
+    # Сравнивается только по key; tag — исходная позиция, по ней видно, сохранён ли порядок равных
+    __slots__ = ("key", "tag")
+
+    def __init__(self, key, tag):
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    __hash__ = None
+
+
+def check_sort(func, arr, stable=False):
+    # Список нарушенных свойств (пустой, если всё хорошо)
+    data = list(arr)
+    out = func(data)
+    if out is None:
+        out = data
+    out = list(out)
+    problems = []
+    if any(a > b for a, b in zip(out, out[1:])):
+        problems.append("not sorted")
+    if sorted(out) != sorted(arr):
+        problems.append("not a permutation of the input")
+    if stable:
+        tagged = [_Tagged(x, i) for i, x in enumerate(arr)]
+        work = list(tagged)
+        out = func(work)
+        if out is None:
+            out = work
+        for a, b in zip(out, out[1:]):
+            if a.key == b.key and a.tag > b.tag:
+                break
+        else:
+            return problems
+        problems.append("not stable")
+    return problems
+
+
+def property_check(algos=None, generators=None, sizes=PROPERTY_SIZES, seeds=PROPERTY_SEEDS):
+    if algos is None:
+        algos = ALGORITHMS
+    if generators is None:
+        generators = GENERATORS
+    failures = []
+    for gen_name, gen in generators.items():
+        for n in sizes:
+            for seed in seeds:
+                arr = gen(n, seed)
+                for algo_name, algo in algos.items():
+                    if not is_compatible(algo_name, gen_name):
+                        continue
+                    stable = algo_name in STABLE and seed == seeds[0]
+                    for problem in check_sort(algo, arr, stable=stable):
+                        failures.append({
+                            "algorithm": algo_name, "generator": gen_name, "n": n, "seed": seed, "problem": problem,
+                        })
+    return failures
+
+
+def _record_key(record):
+    return record["algorithm"], record["generator"], record["n"]
+
+
+def compare_baseline(results, baseline, tolerance=BASELINE_TOLERANCE, noise_ns=BASELINE_NOISE_NS):
+    # Регрессия — медиана выросла больше чем на tolerance и больше чем на noise_ns
+    reference = {_record_key(r): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = reference.get(_record_key(r))
+        if base is None:
+            continue
+        limit = max(base["median_ns"] * (1 + tolerance), base["median_ns"] + noise_ns)
+        if r["median_ns"] > limit:
+            regressions.append({
+                "algorithm": r["algorithm"], "generator": r["generator"], "n": r["n"],
+                "baseline_ns": base["median_ns"], "median_ns": r["median_ns"],
+                "ratio": r["median_ns"] / base["median_ns"],
+            })
+    return regressions
+
+
+def rerun_baseline(baseline, repeat=5, warmup=1, seed=42, cache=None):
+    # Повторяет замеры для тех же (algorithm, generator, n), что записаны в базовой линии
+    results = []
+    inputs = {}
+    for base in baseline:
+        name, gen_name, n = _record_key(base)
+        if name not in ALGORITHMS or gen_name not in GENERATORS:
+            continue
+        if (gen_name, n) not in inputs:
+            inputs[gen_name, n] = _dataset(cache, gen_name, GENERATORS[gen_name], n, seed)
+        samples = measure(ALGORITHMS[name], inputs[gen_name, n], repeat=repeat, warmup=warmup)
+        record = {"algorithm": name, "generator": gen_name, "n": n}
+        record.update(summarize(samples))
+        results.append(record)
+    return results
+
+
+def format_regressions(regressions):
+    lines = []
+    for r in regressions:
+        lines.append(
+            f"{r['algorithm']:<16} {r['generator']:<11} {r['n']:>8}  "
+            f"{r['baseline_ns'] / 1e6:>9.3f} -> {r['median_ns'] / 1e6:>9.3f} ms  x{r['ratio']:.2f}"
+        )
+    return "\n".join(lines)
@@ -1,9 +1,11 @@
 import unittest
+import random
 import sys, os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.algorithms import *
+from src.algorithms import _intro_sort_range, _use_numpy, _counting_span_ok
 
 class TestFactorial(unittest.TestCase):
     def test_factorial_5(self):
@@ -17,6 +19,78 @@ class TestFibonacci(unittest.TestCase):
     def test_fibo_rec(self):
         self.assertEqual(fibo_recursive(5), 5)
 
+class TestFastPaths(unittest.TestCase):
+    def test_factorial_fast(self):
+        for n in list(range(40)) + [100, 1000, 1025]:
+            self.assertEqual(factorial_fast(n), factorial(n))
+    def test_fibo_fast(self):
+        for n in list(range(40)) + [1000, 1025]:
+            self.assertEqual(fibo_fast(n), fibo(n))
+    def test_fibo_mod(self):
+        for m in (1, 2, 10, 10 ** 9 + 7):
+            for n in (0, 1, 2, 50, 1000):
+                self.assertEqual(fibo_mod(n, m), fibo(n) % m)
+    def test_negative(self):
+        for func in (factorial_fast, fibo_fast):
+            with self.assertRaises(ValueError):
+                func(-1)
+        with self.assertRaises(ValueError):
+            fibo_mod(5, 0)
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        FIBO_CACHE.clear()
+        FACTORIAL_CACHE.clear()
+    def test_values(self):
+        for n in (0, 5, 99, 100, 150, 1500, 1499, 3000):
+            self.assertEqual(factorial_memo(n), factorial(n))
+        for n in (0, 5, 199, 200, 5000, 4999, 6000):
+            self.assertEqual(fibo_memo(n), fibo(n))
+    def test_no_recursion_limit(self):
+        self.assertEqual(factorial_memo(5000), factorial(5000))
+    def test_far_from_checkpoint(self):
+        # Разрыв больше FIBO_JUMP считается удвоением; соседние значения — шагами от сохранённой пары
+        for n in (100000, 100003, 100000 + FIBO_JUMP + 1):
+            self.assertEqual(fibo_memo(n), fibo_fast(n))
+    def test_hits(self):
+        fibo_memo(1000)
+        fibo_memo(1000)
+        self.assertEqual(FIBO_CACHE.info()["hits"], 1)
+    def test_lru(self):
+        cache = MemoCache(2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        cache.get(1)
+        cache.put(3, "c")
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+    def test_save_load(self):
+        import tempfile
+        factorial_memo(2000)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "memo.json")
+            save_memo(path)
+            FACTORIAL_CACHE.clear()
+            load_memo(path)
+        self.assertIn(2000, FACTORIAL_CACHE)
+        self.assertEqual(factorial_memo(2000), factorial(2000))
+
+class TestBatch(unittest.TestCase):
+    def test_request_order(self):
+        ns = [10, 3, 10, 0, 7]
+        self.assertEqual(factorials(ns), [factorial(n) for n in ns])
+        self.assertEqual(fibos(ns), [fibo(n) for n in ns])
+    def test_jump(self):
+        ns = [5, 20000, 3]
+        self.assertEqual(fibos(ns), [fibo(n) for n in ns])
+    def test_stream(self):
+        result = list(fibos([9, 2, 9], stream=True))
+        self.assertEqual(result, [(2, 1), (9, 34)])
+        self.assertEqual(next(factorials([4], stream=True)), (4, 24))
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            factorials([1, -1])
+
 class TestSortingFunctions(unittest.TestCase):
     def setUp(self):
         self.arr = [5, 2, 8, 1, 9]
@@ -27,6 +101,196 @@ class TestSortingFunctions(unittest.TestCase):
         self.assertEqual(quick_sort(self.arr), self.expected)
     def test_heap(self):
         self.assertEqual(heap_sort(self.arr), self.expected)
+    def test_quick_inplace(self):
+        self.assertEqual(quick_sort_inplace(self.arr), self.expected)
+        self.assertEqual(self.arr, [5, 2, 8, 1, 9])
+
+class TestQuickInplace(unittest.TestCase):
+    def test_shapes(self):
+        for arr in (
+            rand_int_array(3000, 0, 10 ** 6, seed=4),
+            many_duplicates(3000, k=3, seed=4),
+            reverse_sorted(3000),
+            [7] * 3000,
+            rand_float_array(3000, seed=4),
+        ):
+            self.assertEqual(quick_sort_inplace(arr), sorted(arr))
+    def test_no_recursion_limit(self):
+        arr = list(range(50000)) + list(range(50000))
+        self.assertEqual(quick_sort_inplace(arr), sorted(arr))
+
+class TestHybridSort(unittest.TestCase):
+    def test_insertion(self):
+        self.assertEqual(insertion_sort([5, 2, 8, 1, 9]), [1, 2, 5, 8, 9])
+    def test_intro(self):
+        arr = rand_int_array(2000, -50, 50, seed=1) + [0.5, -0.25]
+        self.assertEqual(intro_sort(arr), sorted(arr))
+    def test_intro_heap_fallback(self):
+        arr = rand_int_array(500, 0, 10 ** 6, seed=2)
+        a = list(arr)
+        _intro_sort_range(a, 0, len(a) - 1, 0)
+        self.assertEqual(a, sorted(arr))
+    def test_choose(self):
+        self.assertEqual(choose_sort([3, 1, 2]), "insertion")
+        self.assertEqual(choose_sort(list(range(100))), "sorted")
+        self.assertEqual(choose_sort(reverse_sorted(100)), "reversed")
+        self.assertEqual(choose_sort(many_duplicates(1000, k=10, seed=1)), "counting")
+        self.assertEqual(choose_sort(rand_int_array(1000, 0, 10 ** 9, seed=1)), "radix")
+        self.assertEqual(choose_sort([x * 10 ** 6 for x in many_duplicates(1000, k=10, seed=1)]), "quick")
+        self.assertEqual(choose_sort(rand_float_array(1000, seed=1)), "intro")
+    def test_sort(self):
+        for arr in (
+            rand_int_array(1000, -10 ** 9, 10 ** 9, seed=3),
+            rand_int_array(1000, -10 ** 9, 10 ** 9, seed=4) + [10 ** 30, -10 ** 25],
+            nearly_sorted(1000, 20, seed=3),
+            many_duplicates(1000, k=3, seed=3),
+            reverse_sorted(1000),
+            rand_float_array(1000, seed=3),
+            [],
+        ):
+            self.assertEqual(sort(arr), sorted(arr))
+
+class TestBucketSort(unittest.TestCase):
+    def test_exact_values(self):
+        # Без нормализации: на выходе ровно те же числа, что на входе
+        arr = rand_int_array(2000, -10 ** 9, 10 ** 9, seed=8)
+        result = bucket_sort(arr)
+        self.assertEqual(result, sorted(arr))
+        self.assertTrue(all(type(x) is int for x in result))
+    def test_shapes(self):
+        for arr in (
+            rand_float_array(5000, seed=8),
+            skewed_float_array(5000, power=40, seed=8),
+            many_duplicates(5000, k=3, seed=8),
+            [0.1, 0.1, 0.1],
+            [],
+        ):
+            self.assertEqual(bucket_sort(arr), sorted(arr))
+    def test_extreme_ranges(self):
+        for arr in (
+            [0.0] * 20 + [5e-324] * 20,
+            [10 ** 400, 0] + list(range(50)),
+            [-10 ** 400, 10 ** 400] * 20 + [3],
+            [1e308, -1e308] * 20,
+            [0, 0.5, 7] * 20,
+        ):
+            self.assertEqual(bucket_sort(arr), sorted(arr))
+
+class TestCountingSort(unittest.TestCase):
+    def test_dense(self):
+        arr = many_duplicates(1000, k=20, seed=7) + [-3]
+        self.assertEqual(counting_sort(arr), sorted(arr))
+    def test_sparse_outlier(self):
+        # Диапазон 10**18 — плотная таблица не создаётся
+        arr = [0, 10 ** 18, 5, 5, -10 ** 18]
+        self.assertFalse(_counting_span_ok(2 * 10 ** 18 + 1, len(arr)))
+        self.assertEqual(counting_sort(arr), sorted(arr))
+    def test_bignum_sparse(self):
+        arr = [10 ** 30, -1, 10 ** 30]
+        self.assertEqual(counting_sort(arr), sorted(arr))
+
+class TestRadixLSD(unittest.TestCase):
+    def test_widths(self):
+        arr = rand_int_array(2000, -10 ** 18, 10 ** 18, seed=6) + [2 ** 63 - 1, -2 ** 63, 0]
+        for bits in (1, 4, 8, 11, 16):
+            self.assertEqual(radix_sort_lsd(arr, bits), sorted(arr))
+    def test_buffers(self):
+        from array import array
+        self.assertEqual(radix_sort_lsd(array("q", [3, -1, 2])), array("q", [-1, 2, 3]))
+        self.assertEqual(radix_sort_lsd(memoryview(array("q", [3, -1, 2]))), array("q", [-1, 2, 3]))
+    def test_edge_cases(self):
+        self.assertEqual(radix_sort_lsd([]), [])
+        self.assertEqual(radix_sort_lsd([7] * 10), [7] * 10)
+        self.assertEqual(radix_sort_lsd([10 ** 20, 1]), [1, 10 ** 20])
+        with self.assertRaises(ValueError):
+            radix_sort_lsd([1], bits=0)
+
+class TestParallelSort(unittest.TestCase):
+    def test_shared_memory_types(self):
+        for arr in (rand_int_array(3000, -10 ** 9, 10 ** 9, seed=9), rand_float_array(3000, seed=9)):
+            self.assertEqual(parallel_sort(arr, workers=2, min_size=0), sorted(arr))
+    def test_pickled_fallback(self):
+        arr = [3, 0.5, 10 ** 30, -1] * 50
+        self.assertEqual(parallel_sort(arr, workers=2, min_size=0, kernel=heap_sort), sorted(arr))
+    def test_small_input_sequential(self):
+        self.assertEqual(parallel_sort([3, 1, 2], workers=4), [1, 2, 3])
+        with self.assertRaises(ValueError):
+            parallel_sort([1], workers=0)
+
+class TestExternalSort(unittest.TestCase):
+    def test_many_runs(self):
+        arr = rand_int_array(20000, -10 ** 12, 10 ** 12, seed=10)
+        # ~100 чисел на кусок — 200 временных файлов и двухпроходное слияние
+        result = list(iter_external_sort(arr, memory_limit=100 * EXTERNAL_ITEM_BYTES))
+        self.assertEqual(result, sorted(arr))
+    def test_file_to_file(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, "in.txt")
+            dst = os.path.join(d, "out.txt")
+            with open(src, "w") as f:
+                f.write("0.5 -2\n3.25\n\n1\n")
+            count = external_sort(src, dst, memory_limit=2 * EXTERNAL_ITEM_BYTES, typecode="d")
+            with open(dst) as f:
+                self.assertEqual([float(x) for x in f.read().split()], [-2, 0.5, 1, 3.25])
+            self.assertEqual(count, 4)
+
+@unittest.skipUnless(np is not None, "numpy не установлен")
+class TestNumpyBackend(unittest.TestCase):
+    def setUp(self):
+        self.ints = rand_int_array(5000, -10 ** 12, 10 ** 12, seed=5)
+        self.small = many_duplicates(5000, k=50, seed=5)
+        self.floats = rand_float_array(5000, seed=5)
+    def test_list_in_list_out(self):
+        self.assertEqual(counting_sort(self.small, backend="numpy"), sorted(self.small))
+        self.assertEqual(radix_sort(self.ints, backend="numpy"), sorted(self.ints))
+        self.assertEqual(bucket_sort(self.floats, backend="numpy"), sorted(self.floats))
+    def test_ndarray_in_ndarray_out(self):
+        result = radix_sort(np.array(self.ints), backend="numpy")
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.tolist(), sorted(self.ints))
+    def test_auto_threshold(self):
+        self.assertFalse(_use_numpy([1, 2, 3], "auto"))
+        self.assertTrue(_use_numpy(np.array([1, 2, 3]), "auto"))
+    def test_counting_sparse(self):
+        arr = [0, 10 ** 15, 7, 7]
+        self.assertEqual(counting_sort(arr, backend="numpy"), sorted(arr))
+    def test_counting_narrow_and_edge_dtypes(self):
+        for values, dtype in (
+            ([-128, 127, 0], np.int8),
+            ([-20000, 20000, 5, 7], np.int16),
+            ([255, 0, 3], np.uint8),
+            ([2 ** 63 - 1, 2 ** 63 - 5], np.int64),
+            ([-2 ** 63, -2 ** 63 + 4], np.int64),
+            ([2 ** 64 - 1, 2 ** 64 - 3, 2 ** 64 - 1], np.uint64),
+        ):
+            for backend in ("numpy", "auto"):
+                result = counting_sort(np.array(values, dtype=dtype), backend=backend)
+                self.assertEqual(result.dtype, dtype)
+                self.assertEqual(result.tolist(), sorted(values))
+    def test_bignum_fallback(self):
+        arr = [10 ** 30, -5, 3]
+        self.assertEqual(radix_sort(arr, backend="numpy"), sorted(arr))
+    def test_radix_uint64(self):
+        arr = [2 ** 63 + 5, 1, 2 ** 64 - 1]
+        self.assertEqual(radix_sort(arr, backend="numpy"), sorted(arr))
+        result = radix_sort(np.array(arr, dtype=np.uint64), backend="numpy")
+        self.assertEqual(result.dtype, np.uint64)
+        self.assertEqual(result.tolist(), sorted(arr))
+    def test_bucket_full_int64_range(self):
+        info = np.iinfo(np.int64)
+        arr = [info.max, info.min, 0, 5, -7] * 10
+        self.assertEqual(bucket_sort(arr, backend="numpy"), sorted(arr))
+        result = bucket_sort(np.array(arr), backend="numpy")
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.tolist(), sorted(arr))
+        arr = [2 ** 64 - 1, 3, 2 ** 63] * 10
+        self.assertEqual(bucket_sort(np.array(arr, dtype=np.uint64), backend="numpy").tolist(), sorted(arr))
+    def test_bucket_keeps_element_type(self):
+        for arr in ([2 ** 63, -1, 5], [1, 2.5, 0]):
+            result = bucket_sort(arr, backend="numpy")
+            self.assertEqual(result, sorted(arr))
+            self.assertEqual([type(x) for x in result], [type(x) for x in sorted(arr)])
 
 class TestStack(unittest.TestCase):
     def test_basic(self):
@@ -51,5 +315,222 @@ class TestQueue(unittest.TestCase):
         self.assertEqual(q.dequeue(), 1)
         self.assertEqual(len(q), 1)
 
+class TestMinMaxQueue(unittest.TestCase):
+    def test_min_max(self):
+        q = MinMaxQueue()
+        for x in [3, 1, 4, 1, 5]:
+            q.enqueue(x)
+        self.assertEqual((q.min(), q.max()), (1, 5))
+        q.dequeue()
+        q.dequeue()
+        self.assertEqual((q.min(), q.max()), (1, 5))
+        q.dequeue()
+        q.dequeue()
+        self.assertEqual((q.min(), q.max()), (5, 5))
+        q.dequeue()
+        with self.assertRaises(IndexError):
+            q.min()
+
+class TestAggregateQueue(unittest.TestCase):
+    def test_order_kept(self):
+        # Конкатенация строк ассоциативна, но не коммутативна — проверяет порядок свёртки
+        q = AggregateQueue(lambda a, b: a + b)
+        for ch in "abcd":
+            q.enqueue(ch)
+        self.assertEqual(q.dequeue(), "a")
+        q.enqueue("e")
+        self.assertEqual(q.aggregate(), "bcde")
+        self.assertEqual(q.front(), "b")
+        self.assertEqual(len(q), 4)
+
+class TestSlidingWindow(unittest.TestCase):
+    def test_windows(self):
+        import math
+        import operator
+        data = rand_int_array(200, 1, 60, seed=11)
+        k = 7
+        windows = [data[i:i + k] for i in range(len(data) - k + 1)]
+        self.assertEqual(list(sliding_window(data, k, min)), [min(w) for w in windows])
+        self.assertEqual(list(sliding_window(data, k, max)), [max(w) for w in windows])
+        self.assertEqual(list(sliding_window(data, k, operator.add)), [sum(w) for w in windows])
+        self.assertEqual(list(sliding_window(data, k, math.gcd)), [math.gcd(*w) for w in windows])
+    def test_short_input(self):
+        self.assertEqual(list(sliding_window([1, 2], 3)), [])
+
+class TestThreadSafe(unittest.TestCase):
+    def test_producers_consumers(self):
+        import threading
+        q = ThreadSafeQueue(maxsize=8)
+        got = []
+        def produce(base):
+            for i in range(200):
+                q.put(base + i)
+        def consume():
+            while True:
+                x = q.get()
+                if x is None:
+                    return
+                got.append(x)
+        consumers = [threading.Thread(target=consume) for _ in range(3)]
+        producers = [threading.Thread(target=produce, args=(k * 1000,)) for k in range(3)]
+        for t in consumers + producers:
+            t.start()
+        for t in producers:
+            t.join()
+        for _ in consumers:
+            q.put(None)
+        for t in consumers:
+            t.join()
+        self.assertEqual(sorted(got), sorted(k * 1000 + i for k in range(3) for i in range(200)))
+    def test_timeouts(self):
+        q = ThreadSafeQueue(maxsize=1)
+        q.enqueue(1)
+        with self.assertRaises(Full):
+            q.enqueue(2, timeout=0.01)
+        self.assertEqual(q.dequeue(), 1)
+        with self.assertRaises(Empty):
+            q.dequeue(block=False)
+        s = ThreadSafeStack()
+        s.push(3)
+        s.push(1)
+        self.assertEqual(s.min(), 1)
+        self.assertEqual(s.pop(), 1)
+        with self.assertRaises(Empty):
+            ThreadSafeStack().pop(timeout=0.01)
+
+class TestAsync(unittest.TestCase):
+    def test_queue(self):
+        import asyncio
+        async def main():
+            q = AsyncQueue(maxsize=2)
+            async def produce():
+                for i in range(50):
+                    await q.put(i)
+            task = asyncio.ensure_future(produce())
+            got = [await q.get() for _ in range(50)]
+            await task
+            with self.assertRaises(Empty):
+                await q.get(timeout=0.01)
+            return got
+        self.assertEqual(asyncio.run(main()), list(range(50)))
+    def test_stack(self):
+        import asyncio
+        async def main():
+            s = AsyncStack(maxsize=1)
+            await s.push(1)
+            with self.assertRaises(Full):
+                await s.push(2, timeout=0.01)
+            return await s.pop()
+        self.assertEqual(asyncio.run(main()), 1)
+    def test_competing_getters(self):
+        import asyncio
+        async def main():
+            q = AsyncQueue()
+            waiting = asyncio.ensure_future(q.get(timeout=5))
+            for _ in range(3):
+                await asyncio.sleep(0)
+            await q.put(1)
+            await asyncio.sleep(0)
+            # Ждущий уже разбужен, но ещё не продолжил — второй потребитель забирает элемент раньше
+            got = [await q.get()] if q.items else []
+            for _ in range(3):
+                await asyncio.sleep(0)
+            await q.put(2)
+            got.append(await waiting)
+            got.extend(q.items)
+            return sorted(got)
+        self.assertEqual(asyncio.run(main()), [1, 2])
+    def test_competing_putters(self):
+        import asyncio
+        async def main():
+            q = AsyncQueue(maxsize=1)
+            await q.put(0)
+            waiting = asyncio.ensure_future(q.put(1, timeout=5))
+            for _ in range(3):
+                await asyncio.sleep(0)
+            await q.get()
+            await asyncio.sleep(0)
+            # Место освободилось, но второй производитель занимает его раньше разбуженного
+            if not q.items:
+                await q.put(2)
+            for _ in range(3):
+                await asyncio.sleep(0)
+            self.assertLessEqual(len(q), 1)
+            got = [await q.get()]
+            await waiting
+            got.extend(q.items)
+            return sorted(got)
+        self.assertEqual(asyncio.run(main()), [1, 2])
+
+class TestTypedStack(unittest.TestCase):
+    def test_basic(self):
+        s = TypedStack()
+        s.push(5)
+        s.push_many([10, 3, 7])
+        self.assertEqual(s.min(), 3)
+        self.assertEqual(s.pop_many(2), [7, 3])
+        self.assertEqual(s.min(), 5)
+        self.assertEqual(s.pop(), 10)
+        self.assertEqual(len(s), 1)
+    def test_errors(self):
+        s = TypedStack("d")
+        with self.assertRaises(IndexError):
+            s.pop()
+        with self.assertRaises(IndexError):
+            s.pop_many(1)
+        with self.assertRaises(TypeError):
+            TypedStack("q").push("x")
+
+class TestTypedQueue(unittest.TestCase):
+    def test_wraparound(self):
+        q = TypedQueue(capacity=4)
+        q.enqueue_many([1, 2, 3])
+        self.assertEqual(q.dequeue_many(2), [1, 2])
+        q.enqueue_many([4, 5, 6])  # запись переходит через конец буфера
+        self.assertEqual(q.front(), 3)
+        q.enqueue(7)  # буфер заполнен — растёт
+        self.assertEqual(q.dequeue_many(len(q)), [3, 4, 5, 6, 7])
+        self.assertTrue(q.is_empty())
+    def test_empty(self):
+        q = TypedQueue()
+        with self.assertRaises(IndexError):
+            q.dequeue()
+        with self.assertRaises(IndexError):
+            q.dequeue_many(1)
+
+class TestGenerators(unittest.TestCase):
+    def test_seed_isolated(self):
+        random.seed(1)
+        before = random.random()
+        random.seed(1)
+        self.assertEqual(rand_int_array(10, 0, 9, seed=5), rand_int_array(10, 0, 9, seed=5))
+        self.assertEqual(random.random(), before)  # глобальное состояние не сбито
+    def test_chunks(self):
+        chunks = list(stream_array("random", 1000, seed=3, chunk_size=300))
+        self.assertEqual([len(c) for c in chunks], [300, 300, 300, 100])
+        self.assertEqual(make_array("random", 1000, seed=3), [x for c in chunks for x in c])
+    def test_all_kinds(self):
+        for kind in STREAMS:
+            a = make_array(kind, 500, seed=7, out="array")
+            self.assertEqual(len(a), 500, kind)
+            self.assertEqual(a.tolist(), make_array(kind, 500, seed=7), kind)
+        with self.assertRaises(ValueError):
+            make_array("nope", 10)
+    def test_shapes(self):
+        self.assertEqual(organ_pipe(6), [0, 1, 2, 2, 1, 0])
+        self.assertEqual(sawtooth(5, period=2), [0, 1, 0, 1, 0])
+        self.assertEqual(all_equal(3, 9), [9, 9, 9])
+        self.assertEqual(list(stream_array("reverse", 5, chunk_size=2)), [[4, 3], [2, 1], [0]])
+        runs = sorted_runs(100, runs=4, seed=1)
+        for i in range(0, 100, 25):
+            self.assertEqual(runs[i:i + 25], sorted(runs[i:i + 25]))
+        z = zipf_array(2000, k=50, seed=2)
+        self.assertTrue(all(1 <= x <= 50 for x in z))
+        self.assertGreater(z.count(1), z.count(50))
+    @unittest.skipUnless(np is not None, "numpy не установлен")
+    def test_numpy_out(self):
+        for kind in STREAMS:
+            self.assertEqual(len(make_array(kind, 300, seed=1, out="numpy")), 300, kind)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import sys, os
+import tempfile
+import json
+import csv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bench import *
+
+class TestStats(unittest.TestCase):
+    def test_percentile(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0.5), 3)
+        self.assertAlmostEqual(percentile([0, 10], 0.95), 9.5)
+    def test_summarize(self):
+        stats = summarize([4, 1, 3, 2])
+        self.assertEqual(stats["repeat"], 4)
+        self.assertEqual(stats["min_ns"], 1)
+        self.assertEqual(stats["median_ns"], 2.5)
+
+class TestMeasure(unittest.TestCase):
+    def test_fresh_copy(self):
+        seen = []
+        def inplace(a):
+            seen.append(list(a))
+            a.sort()
+        arr = [3, 1, 2]
+        samples = measure(inplace, arr, repeat=3, warmup=1)
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(arr, [3, 1, 2])
+        self.assertTrue(all(x == [3, 1, 2] for x in seen))
+
+class TestSuite(unittest.TestCase):
+    def test_skips_int_only_on_floats(self):
+        results = run_suite(n=50, repeat=1, warmup=0)
+        pairs = {(r["algorithm"], r["generator"]) for r in results}
+        self.assertIn(("quick", "float"), pairs)
+        self.assertNotIn(("counting", "float"), pairs)
+    def test_output(self):
+        results = run_suite({"heap": ALGORITHMS["heap"]}, {"random": GENERATORS["random"]}, n=20, repeat=2)
+        with tempfile.TemporaryDirectory() as d:
+            write_json(results, os.path.join(d, "r.json"))
+            write_csv(results, os.path.join(d, "r.csv"))
+            self.assertEqual(read_json(os.path.join(d, "r.json")), json.loads(json.dumps(results)))
+            with open(os.path.join(d, "r.csv")) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]["algorithm"], "heap")
+
+class TestSweep(unittest.TestCase):
+    def test_geometric_sizes(self):
+        self.assertEqual(geometric_sizes(100, 10 ** 4, per_decade=1), [100, 1000, 10000])
+    def test_caps(self):
+        results = sweep({"bubble": ALGORITHMS["bubble"], "heap": ALGORITHMS["heap"]},
+                        sizes=[10, 20, 40], caps={"bubble": 20}, repeat=1)
+        sizes = {r["algorithm"]: [] for r in results}
+        for r in results:
+            sizes[r["algorithm"]].append(r["n"])
+        self.assertEqual(sizes["bubble"], [10, 20])
+        self.assertEqual(sizes["heap"], [10, 20, 40])
+    def test_fit_models(self):
+        square = [(n, 3 * n * n) for n in (100, 1000, 10000)]
+        linear = [(n, 50 * n) for n in (100, 1000, 10000)]
+        self.assertEqual(fit_complexity(square)["model"], "O(n^2)")
+        self.assertEqual(fit_complexity(linear)["model"], "O(n)")
+    def test_crossover(self):
+        fits = {
+            "slow_start": {"model": "O(n)", "coef": 100.0},
+            "quadratic": {"model": "O(n^2)", "coef": 1.0},
+        }
+        [c] = crossovers(fits)
+        self.assertEqual(c["below"], "quadratic")
+        self.assertEqual(c["above"], "slow_start")
+        self.assertTrue(99 <= c["n"] <= 101)
+
+class TestDatasetCache(unittest.TestCase):
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = DatasetCache(d)
+            first = cache.load("random", 500, 1)
+            again = cache.load("random", 500, 1)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(list(again), GENERATORS["random"](500, 1))
+            self.assertEqual(list(first), list(again))
+            self.assertEqual(list(cache.load("float", 50, 1)), GENERATORS["float"](50, 1))
+            self.assertEqual(list(cache.load("random", 0, 1)), [])
+            self.assertNotEqual(cache.key("random", 10, 1), cache.key("random", 10, 2))
+            self.assertNotEqual(cache.key("zipf", 10, 1, {"s": 1.1}), cache.key("zipf", 10, 1, {"s": 1.2}))
+    def test_params(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = DatasetCache(d)
+            data = cache.load("zipf", 200, 1, params={"s": 1.1, "k": 50})
+            self.assertEqual(list(data), zipf_array(200, s=1.1, k=50, seed=1))
+            self.assertEqual(list(cache.load("zipf", 200, 1, params={"s": 1.1, "k": 50})), list(data))
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertNotEqual(list(cache.load("zipf", 200, 1, params={"s": 2.0, "k": 50})), list(data))
+    def test_parallel_sort_from_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            data = DatasetCache(d).load("random", 2000, 1)
+            self.assertEqual(parallel_sort(data, workers=2, min_size=0), sorted(data))
+    def test_eviction(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = DatasetCache(d, max_bytes=2500)
+            for seed in range(3):
+                cache.load("random", 100, seed)  # по 808 байт
+                os.utime(cache.file("random", 100, seed), (seed, seed))
+            self.assertEqual(len(cache.entries()), 3)
+            cache.load("random", 100, 3)
+            self.assertLessEqual(cache.size(), 2500)
+            self.assertFalse(os.path.exists(cache.file("random", 100, 0)))
+            self.assertTrue(os.path.exists(cache.file("random", 100, 3)))
+            cache.clear()
+            self.assertEqual(cache.entries(), [])
+    def test_suite_uses_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = DatasetCache(d)
+            run_suite({"heap": ALGORITHMS["heap"]}, {"random": GENERATORS["random"]}, n=50, repeat=1, cache=cache)
+            run_suite({"sort": ALGORITHMS["sort"]}, {"random": GENERATORS["random"]}, n=50, repeat=1, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+class TestRegressionGate(unittest.TestCase):
+    def test_all_kernels_correct(self):
+        self.assertEqual(property_check(sizes=(0, 1, 2, 17, 200), seeds=(0, 1)), [])
+    def test_check_sort_catches(self):
+        self.assertEqual(check_sort(lambda a: a[:-1] + [a[-1]], [2, 1]), ["not sorted"])
+        self.assertEqual(check_sort(lambda a: [1, 1], [2, 1]), ["not a permutation of the input"])
+        self.assertEqual(check_sort(ALGORITHMS["heap"], [1, 0, 1, 0, 1, 0, 1] * 5, stable=True), ["not stable"])
+        self.assertEqual(check_sort(ALGORITHMS["insertion"], [1, 0, 1, 0, 1, 0, 1] * 5, stable=True), [])
+    def test_check_sort_in_place_stability(self):
+        # Сортировка на месте возвращает None — проверять нужно её копию, а не исходный список
+        def heap_in_place(a):
+            a[:] = ALGORITHMS["heap"](a)
+        self.assertEqual(check_sort(heap_in_place, [1, 0, 1, 0, 1, 0, 1] * 5, stable=True), ["not stable"])
+    def test_compare_baseline(self):
+        base = [{"algorithm": "heap", "generator": "random", "n": 10, "median_ns": 1_000_000}]
+        slow = [{"algorithm": "heap", "generator": "random", "n": 10, "median_ns": 1_300_000}]
+        ok = [{"algorithm": "heap", "generator": "random", "n": 10, "median_ns": 1_200_000}]
+        other = [{"algorithm": "heap", "generator": "random", "n": 20, "median_ns": 9_000_000}]
+        [r] = compare_baseline(slow, base)
+        self.assertAlmostEqual(r["ratio"], 1.3)
+        self.assertEqual(compare_baseline(ok, base), [])
+        self.assertEqual(compare_baseline(other, base), [])
+        # Шум на коротких замерах не считается регрессией
+        tiny = [{"algorithm": "heap", "generator": "random", "n": 10, "median_ns": 1000}]
+        self.assertEqual(compare_baseline([dict(tiny[0], median_ns=2000)], tiny), [])
+    def test_rerun(self):
+        base = run_suite({"heap": ALGORITHMS["heap"]}, {"random": GENERATORS["random"]}, n=30, repeat=1)
+        again = rerun_baseline(base + [{"algorithm": "gone", "generator": "random", "n": 30}], repeat=1)
+        self.assertEqual([(r["algorithm"], r["n"]) for r in again], [("heap", 30)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys, os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cli import run_args
+
+def run(argv, stdin=""):
+    out = io.StringIO()
+    with mock.patch("sys.stdin", io.StringIO(stdin)), redirect_stdout(out):
+        run_args(argv)
+    return out.getvalue()
+
+class TestArgs(unittest.TestCase):
+    def test_sort_stdin(self):
+        self.assertEqual(run(["sort", "--algo", "radix"], "5 3 -1\n9 2\n").split(), ["-1", "2", "3", "5", "9"])
+        self.assertEqual(run(["sort", "--float"], "0.5 0.25\n").split(), ["0.25", "0.5"])
+    def test_sort_files(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, "in.txt")
+            dst = os.path.join(d, "out.txt")
+            with open(src, "w") as f:
+                f.write("\n".join(map(str, range(500, 0, -1))))
+            with mock.patch("sys.stderr", io.StringIO()):
+                run(["sort", "--external", "--memory", "0", "-i", src, "-o", dst])
+            with open(dst) as f:
+                self.assertEqual([int(x) for x in f], list(range(1, 501)))
+    def test_errors(self):
+        with self.assertRaises(SystemExit):
+            run(["sort", "--algo", "nope"])
+        with self.assertRaises(SystemExit):
+            run(["sort", "--float", "--algo", "counting"], "1.5")
+        # Число шире int64 не упаковывается во временный файл внешней сортировки
+        with self.assertRaises(SystemExit) as ctx:
+            run(["sort", "--external", "--memory", "0"], f"1 2 {10 ** 30}\n")
+        self.assertIn("Ошибка", str(ctx.exception.code))
+        with self.assertRaises(SystemExit):
+            run(["bench", "--algos", "nope"])
+    def test_numeric(self):
+        self.assertEqual(run(["fib", "90"]).strip(), "2880067194370816120")
+        self.assertEqual(run(["fib", "10", "--mod", "7"]).strip(), "6")
+        self.assertEqual(run(["fact", "20"]).strip(), "2432902008176640000")
+    def test_fib_bad_mod(self):
+        for mod in ("0", "-3"):
+            with self.assertRaises(SystemExit) as ctx:
+                run(["fib", "10", "--mod", mod])
+            self.assertIn("Ошибка", str(ctx.exception.code))
+    def test_bench_json(self):
+        records = json.loads(run(["bench", "--sizes", "50", "100", "--algos", "heap",
+                                  "--generators", "random", "--repeat", "1", "--format", "json"]))
+        self.assertEqual([(r["algorithm"], r["n"]) for r in records], [("heap", 50), ("heap", 100)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,38 +3,25 @@ import shutil
 import zipfile
 import tarfile
 import re
-import json
-from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.logger import log_cmd, setup_logging
 from src.utils import get_file_info, is_safe_path, resolve_path
+from src.history_log import HistoryLog
+from src.history_index import HistoryIndex
+from src.trash import Trash
+from src.journal import Journal
 
 
 class CommandHistory:
     
     def __init__(self, history_file='.history'):
         self.history_file = history_file
-        self.history = []
-        self.undo_stack = []
-        self.trash_dir = '.trash'
-        self._ensure_trash_exists()
-        self._load_history()
-    
-    def _ensure_trash_exists(self):
-        if not os.path.exists(self.trash_dir):
-            os.makedirs(self.trash_dir)
-    
-    def _load_history(self):
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r') as f:
-                    self.history = json.load(f)
-            except:
-                self.history = []
-    
-    def _save_history(self):
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        self.log = HistoryLog(history_file)
+        self.index = HistoryIndex(history_file + '.idx')
+        self.index.sync_from(self.log)
+        self.trash = Trash('.trash')
+        self.trash_dir = self.trash.path
+        self.journal = Journal('.journal', self.trash)
     
     def add(self, cmd, cmd_type=None, args=None):
         entry = {
@@ -43,25 +30,30 @@ class CommandHistory:
             'type': cmd_type,
             'args': args
         }
-        self.history.append(entry)
-        self._save_history()
+        self.log.append(entry)
+        self.index.add(entry)
     
-    def add_undo(self, cmd_type, operation_info):
-        self.undo_stack.append({
-            'type': cmd_type,
-            'info': operation_info,
-            'timestamp': datetime.now().isoformat()
-        })
+    def search(self, text=None, regex=None, cmd_type=None, path=None, since=None, until=None, limit=20):
+        return self.index.search(text, regex, cmd_type, path, since, until, limit)
     
-    def get_history(self, count=10):
-        return self.history[-count:]
+    def suggest(self, query, limit=5):
+        # Сначала команды, начинающиеся с query, потом содержащие его
+        result = self.index.prefix(query, limit)
+        if len(result) < limit:
+            for entry in self.index.search(text=query, limit=limit * 4):
+                if entry['command'] not in result:
+                    result.append(entry['command'])
+                if len(result) == limit:
+                    break
+        return result
     
-    def undo(self):
-        if not self.undo_stack:
-            return None, "История undo пуста"
-        
-        undo_op = self.undo_stack.pop()
-        return undo_op, None
+    def close(self):
+        self.log.close()
+        self.index.close()
+        self.journal.close()
+    
+    def get_history(self, count=10):
+        return self.log.tail(count)
 
 
 class MiniShell:
@@ -70,6 +62,54 @@ class MiniShell:
         self.current_dir = os.path.expanduser('~')
         self.history = CommandHistory()
 
+    def _record(self, command, op):
+        self.history.journal.record(command, op)
+
+    def _trash_existing(self, command, path):
+        # То, что будет перезаписано, сначала уходит в корзину — undo вернёт старую версию
+        if os.path.lexists(path):
+            entry = self.history.trash.put(path)
+            self._record(command, {'kind': 'delete', 'path': path, 'trash_id': entry['id']})
+
+    def _plan_paths(self, base, relpaths):
+        # Какие пути появятся при записи relpaths в base: возвращает верхние из новых путей
+        # (вложенные в них отменятся вместе с ними) и уже существующие файлы, которые будут перезаписаны
+        new = set()
+        overwritten = []
+        for rel in relpaths:
+            parts = [part for part in rel.replace('\\', '/').split('/') if part not in ('', '.')]
+            if not parts or '..' in parts or os.path.isabs(rel):
+                continue
+            path = base
+            for part in parts:
+                path = os.path.join(path, part)
+                if path in new:
+                    break
+                if not os.path.lexists(path):
+                    new.add(path)
+                    break
+            else:
+                if os.path.isfile(path):
+                    overwritten.append(path)
+        tops = sorted(path for path in new if os.path.dirname(path) not in new)
+        return tops, overwritten
+
+    def _extract(self, cmd_str, extract_path, names, extractall):
+        if os.path.exists(extract_path):
+            created, overwritten = self._plan_paths(extract_path, names)
+        else:
+            created, overwritten = [extract_path], []
+        for path in overwritten:
+            self._trash_existing(cmd_str, path)
+        os.makedirs(extract_path, exist_ok=True)
+        extractall(extract_path)
+        self._record(cmd_str, {'kind': 'create', 'paths': created})
+
+    def _tree_relpaths(self, src):
+        for root, dirs, files in os.walk(src):
+            for name in dirs + files:
+                yield os.path.relpath(os.path.join(root, name), src)
+
     def ls(self, path=None, detailed=False):
         try:
             target = resolve_path(self.current_dir, path or '.')
@@ -121,7 +161,12 @@ class MiniShell:
     def mkdir(self, folder):
         try:
             dir_path = resolve_path(self.current_dir, folder)
+            # makedirs создаёт и промежуточные каталоги — отменять нужно самый верхний из новых
+            top = dir_path
+            while not os.path.exists(os.path.dirname(top)):
+                top = os.path.dirname(top)
             os.makedirs(dir_path)
+            self._record(f"mkdir {folder}", {'kind': 'create', 'paths': [top]})
             print(f"Создано: {folder}")
             log_cmd(f"mkdir {folder}")
             self.history.add(f"mkdir {folder}", 'mkdir', {'path': folder})
@@ -132,13 +177,13 @@ class MiniShell:
     def rmdir(self, folder):
         try:
             dir_path = resolve_path(self.current_dir, folder)
-            trash_path = os.path.join(self.history.trash_dir, os.path.basename(folder))
-            shutil.copytree(dir_path, trash_path, dirs_exist_ok=True)
-            shutil.rmtree(dir_path)
+            if not os.path.isdir(dir_path):
+                raise NotADirectoryError("Каталог не существует")
+            entry = self.history.trash.put(dir_path)
             print(f"Удалено: {folder}")
             log_cmd(f"rmdir {folder}")
             self.history.add(f"rmdir {folder}", 'rmdir', {'path': folder})
-            self.history.add_undo('rmdir', {'original_path': folder, 'trash_path': trash_path})
+            self._record(f"rmdir {folder}", {'kind': 'delete', 'path': dir_path, 'trash_id': entry['id']})
         except Exception as e:
             print(f"Ошибка: {e}")
             log_cmd(f"rmdir {folder}", str(e))
@@ -168,16 +213,26 @@ class MiniShell:
             if os.path.isdir(src) and not recursive:
                 raise IsADirectoryError("Используйте -r для копирования каталогов")
             
-            if os.path.isdir(src):
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src, dst)
+            cmd_str = f"cp {'-r' if recursive else ''} {source} {dest}"
+            with self.history.journal.transaction(cmd_str):
+                if os.path.isdir(src):
+                    created, overwritten = self._plan_paths(dst, self._tree_relpaths(src))
+                    if not os.path.exists(dst):
+                        created = [dst]
+                    for path in overwritten:
+                        self._trash_existing(cmd_str, path)
+                    shutil.copytree(src, dst, dirs_exist_ok=True)
+                else:
+                    target = os.path.join(dst, os.path.basename(src)) if os.path.isdir(dst) else dst
+                    self._trash_existing(cmd_str, target)
+                    shutil.copy2(src, target)
+                    created = [target]
+                self._record(cmd_str, {'kind': 'create', 'paths': created})
             
             print(f"Скопировано: {source} → {dest}")
-            log_cmd(f"cp {'-r' if recursive else ''} {source} {dest}")
-            self.history.add(f"cp {'-r' if recursive else ''} {source} {dest}", 'cp', 
+            log_cmd(cmd_str)
+            self.history.add(cmd_str, 'cp', 
                            {'source': source, 'dest': dest, 'recursive': recursive})
-            self.history.add_undo('cp', {'dest': dst})
         except Exception as e:
             print(f"Ошибка: {e}")
             log_cmd(f"cp {'-r' if recursive else ''} {source} {dest}", str(e))
@@ -190,12 +245,15 @@ class MiniShell:
             if not os.path.exists(src):
                 raise FileNotFoundError("Источник не существует")
             
-            original_path = src
-            shutil.move(src, dst)
+            target = os.path.join(dst, os.path.basename(src)) if os.path.isdir(dst) else dst
+            with self.history.journal.transaction(f"mv {source} {dest}"):
+                if os.path.isfile(target):
+                    self._trash_existing(f"mv {source} {dest}", target)
+                shutil.move(src, target)
+                self._record(f"mv {source} {dest}", {'kind': 'move', 'src': src, 'dst': target})
             print(f"Перемещено: {source} → {dest}")
             log_cmd(f"mv {source} {dest}")
             self.history.add(f"mv {source} {dest}", 'mv', {'source': source, 'dest': dest})
-            self.history.add_undo('mv', {'original_path': original_path, 'new_path': dst})
         except Exception as e:
             print(f"Ошибка: {e}")
             log_cmd(f"mv {source} {dest}", str(e))
@@ -216,20 +274,15 @@ class MiniShell:
                     if confirm.lower() != 'y':
                         print("Отменено")
                         return
-                
-                trash_path = os.path.join(self.history.trash_dir, os.path.basename(path))
-                shutil.copytree(full_path, trash_path, dirs_exist_ok=True)
-                shutil.rmtree(full_path)
-            else:
-                trash_path = os.path.join(self.history.trash_dir, os.path.basename(path))
-                shutil.copy2(full_path, trash_path)
-                os.remove(full_path)
+            
+            entry = self.history.trash.put(full_path)
             
             print(f"Удалено: {path}")
             log_cmd(f"rm {'-r' if recursive else ''} {path}")
             self.history.add(f"rm {'-r' if recursive else ''} {path}", 'rm', 
                            {'path': path, 'recursive': recursive})
-            self.history.add_undo('rm', {'original_path': full_path, 'trash_path': trash_path})
+            self._record(f"rm {'-r' if recursive else ''} {path}",
+                         {'kind': 'delete', 'path': full_path, 'trash_id': entry['id']})
         except Exception as e:
             print(f"Ошибка: {e}")
             log_cmd(f"rm {'-r' if recursive else ''} {path}", str(e))
@@ -244,16 +297,20 @@ class MiniShell:
                 archive_name = os.path.basename(src) + '.zip'
             
             archive_path = resolve_path(self.current_dir, archive_name)
-            
-            with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                if os.path.isdir(src):
-                    for root, dirs, files in os.walk(src):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, os.path.dirname(src))
-                            zf.write(file_path, arcname)
-                else:
-                    zf.write(src, os.path.basename(src))
+            cmd_str = f"zip {source} {archive_name}"
+            
+            with self.history.journal.transaction(cmd_str):
+                self._trash_existing(cmd_str, archive_path)
+                with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    if os.path.isdir(src):
+                        for root, dirs, files in os.walk(src):
+                            for file in files:
+                                file_path = os.path.join(root, file)
+                                arcname = os.path.relpath(file_path, os.path.dirname(src))
+                                zf.write(file_path, arcname)
+                    else:
+                        zf.write(src, os.path.basename(src))
+                self._record(cmd_str, {'kind': 'create', 'paths': [archive_path]})
             
             print(f"Архив создан: {archive_name}")
             log_cmd(f"zip {source} {archive_name}")
@@ -274,10 +331,10 @@ class MiniShell:
             else:
                 extract_path = resolve_path(self.current_dir, extract_path)
             
-            os.makedirs(extract_path, exist_ok=True)
-            
-            with zipfile.ZipFile(archive_path, 'r') as zf:
-                zf.extractall(extract_path)
+            cmd_str = f"unzip {archive_name} {extract_path}"
+            with self.history.journal.transaction(cmd_str):
+                with zipfile.ZipFile(archive_path, 'r') as zf:
+                    self._extract(cmd_str, extract_path, zf.namelist(), zf.extractall)
             
             print(f"Архив распакован в: {extract_path}")
             log_cmd(f"unzip {archive_name} {extract_path}")
@@ -297,9 +354,13 @@ class MiniShell:
                 archive_name = os.path.basename(src) + '.tar.gz'
             
             archive_path = resolve_path(self.current_dir, archive_name)
+            cmd_str = f"tar {source} {archive_name}"
             
-            with tarfile.open(archive_path, 'w:gz') as tar:
-                tar.add(src, arcname=os.path.basename(src))
+            with self.history.journal.transaction(cmd_str):
+                self._trash_existing(cmd_str, archive_path)
+                with tarfile.open(archive_path, 'w:gz') as tar:
+                    tar.add(src, arcname=os.path.basename(src))
+                self._record(cmd_str, {'kind': 'create', 'paths': [archive_path]})
             
             print(f"TAR.GZ архив создан: {archive_name}")
             log_cmd(f"tar {source} {archive_name}")
@@ -320,10 +381,10 @@ class MiniShell:
             else:
                 extract_path = resolve_path(self.current_dir, extract_path)
             
-            os.makedirs(extract_path, exist_ok=True)
-            
-            with tarfile.open(archive_path, 'r:gz') as tar:
-                tar.extractall(extract_path)
+            cmd_str = f"untar {archive_name} {extract_path}"
+            with self.history.journal.transaction(cmd_str):
+                with tarfile.open(archive_path, 'r:gz') as tar:
+                    self._extract(cmd_str, extract_path, tar.getnames(), tar.extractall)
             
             print(f"Архив распакован в: {extract_path}")
             log_cmd(f"untar {archive_name} {extract_path}")
@@ -415,162 +476,291 @@ class MiniShell:
             print(f"Ошибка: {e}")
             log_cmd(f"history", str(e))
 
-    def undo_cmd(self):
+    def _parse_time(self, value, end=False):
+        moment = datetime.fromisoformat(value)
+        # Для --until 2025-11-05 берём весь день целиком
+        if end and len(value) == 10:
+            moment += timedelta(days=1)
+        return moment.isoformat()
+
+    def history_search(self, args):
+        cmd_str = f"history search {' '.join(args)}"
         try:
-            undo_op, error = self.history.undo()
-            
-            if error:
-                print(f"Ошибка: {error}")
+            options = {'-e': None, '-t': None, '-p': None, '--since': None, '--until': None, '-n': '20'}
+            prefix_mode = False
+            words = []
+            i = 0
+            while i < len(args):
+                arg = args[i]
+                if arg == '--prefix':
+                    prefix_mode = True
+                elif arg in options:
+                    if i + 1 >= len(args):
+                        raise ValueError(f"{arg}: нужно значение")
+                    options[arg] = args[i + 1]
+                    i += 1
+                else:
+                    words.append(arg)
+                i += 1
+            text = ' '.join(words) or None
+            limit = int(options['-n'])
+            
+            if prefix_mode:
+                commands = self.history.index.prefix(text or '', limit)
+                for i, cmd in enumerate(commands, 1):
+                    print(f"{i:3d}  {cmd}")
+                if not commands:
+                    print("Совпадений не найдено")
+                log_cmd(cmd_str)
                 return
             
-            op_type = undo_op.get('type')
-            info = undo_op.get('info')
-            
-            if op_type == 'cp':
-                if 'dest' in info and os.path.exists(info['dest']):
-                    if os.path.isdir(info['dest']):
-                        shutil.rmtree(info['dest'])
-                    else:
-                        os.remove(info['dest'])
-                    print(f"Отменено: удален {info['dest']}")
-            
-            elif op_type == 'mv':
-                if os.path.exists(info['new_path']):
-                    shutil.move(info['new_path'], info['original_path'])
-                    print(f"Отменено: файл возвращен в {info['original_path']}")
-            
-            elif op_type == 'rm':
-                if os.path.exists(info['trash_path']):
-                    if os.path.isdir(info['trash_path']):
-                        shutil.copytree(info['trash_path'], info['original_path'], dirs_exist_ok=True)
-                    else:
-                        shutil.copy2(info['trash_path'], info['original_path'])
-                    print(f"Отменено: файл восстановлен в {info['original_path']}")
-            
-            else:
-                print(f"Не удается отменить операцию типа '{op_type}'")
-            
+            found = self.history.search(
+                text=text,
+                regex=options['-e'],
+                cmd_type=options['-t'],
+                path=options['-p'],
+                since=self._parse_time(options['--since']) if options['--since'] else None,
+                until=self._parse_time(options['--until'], end=True) if options['--until'] else None,
+                limit=limit,
+            )
+            if not found:
+                print("Совпадений не найдено")
+            for i, entry in enumerate(reversed(found), 1):
+                print(f"{i:3d}  {entry.get('timestamp', 'N/A')}  {entry.get('command', 'N/A')}")
+            log_cmd(cmd_str)
+        except Exception as e:
+            print(f"Ошибка: {e}")
+            log_cmd(cmd_str, str(e))
+
+    def history_isearch(self):
+        # Поиск по мере ввода: строка — новый запрос, номер — выполнить найденную команду, Enter — выход
+        query = ''
+        matches = []
+        while True:
+            line = input(f"(reverse-i-search)'{query}': ").strip()
+            if not line:
+                return
+            if line.isdigit() and matches:
+                number = int(line)
+                if 1 <= number <= len(matches):
+                    cmd_line = matches[number - 1]
+                    print(cmd_line)
+                    self.execute(cmd_line)
+                    return
+            query = line
+            matches = self.history.suggest(query)
+            if not matches:
+                print("  Совпадений не найдено")
+            for i, cmd in enumerate(matches, 1):
+                print(f"  {i}. {cmd}")
+
+    def undo_cmd(self):
+        try:
+            tx = self.history.journal.undo()
+            if tx is None:
+                print("Ошибка: История undo пуста")
+                return
+            print(f"Отменено: {tx['command']}")
             log_cmd("undo")
-        
+        except KeyError:
+            print("Ошибка: Объект уже удалён из корзины")
+            log_cmd("undo", "объект удалён из корзины")
         except Exception as e:
             print(f"Ошибка: {e}")
             log_cmd("undo", str(e))
 
+    def redo_cmd(self):
+        try:
+            tx = self.history.journal.redo()
+            if tx is None:
+                print("Ошибка: Нечего повторять")
+                return
+            print(f"Повторено: {tx['command']}")
+            log_cmd("redo")
+        except KeyError:
+            print("Ошибка: Объект уже удалён из корзины")
+            log_cmd("redo", "объект удалён из корзины")
+        except Exception as e:
+            print(f"Ошибка: {e}")
+            log_cmd("redo", str(e))
+
+    def trash_cmd(self, args):
+        cmd_str = f"trash {' '.join(args)}".strip()
+        trash = self.history.trash
+        try:
+            action = args[0] if args else 'list'
+            if action == 'list':
+                entries = trash.entries()
+                if not entries:
+                    print("Корзина пуста")
+                for entry in entries:
+                    size = '?' if entry['size'] is None else entry['size']
+                    kind = 'd' if entry['is_dir'] else '-'
+                    print(f"{entry['id']}  {entry['deleted_at'][:19]}  {kind} {size:>10}  {entry['original_path']}")
+                if entries:
+                    print(f"Всего: {len(entries)}, {trash.total_size()} байт (лимит {trash.max_bytes})")
+            elif action == 'purge':
+                if len(args) > 1:
+                    for entry_id in args[1:]:
+                        trash.remove(entry_id)
+                    print(f"Удалено из корзины: {len(args) - 1}")
+                else:
+                    print(f"Удалено из корзины: {len(trash.purge())}")
+            elif action == 'restore':
+                if len(args) < 2:
+                    raise ValueError("Укажите id: trash restore <id> [path]")
+                dest = resolve_path(self.current_dir, args[2]) if len(args) > 2 else None
+                print(f"Восстановлено: {trash.restore(args[1], dest)}")
+            else:
+                raise ValueError(f"Неизвестное действие: {action}")
+            log_cmd(cmd_str)
+            self.history.add(cmd_str, 'trash', {'action': action, 'ids': args[1:]})
+        except KeyError as e:
+            print(f"Ошибка: в корзине нет {e}")
+            log_cmd(cmd_str, f"нет {e}")
+        except Exception as e:
+            print(f"Ошибка: {e}")
+            log_cmd(cmd_str, str(e))
+
     def run(self):
         print("Мини-оболочка")
         print("Введите 'help' для справки или 'exit' для выхода")
+        # Чистка корзины идёт в фоне и не задерживает ввод команд
+        self.history.trash.start_gc()
         
         while True:
             try:
                 cmd_line = input(f"\n{self.current_dir}> ").strip()
-                
-                if not cmd_line:
-                    continue
-                
-                parts = cmd_line.split()
-                cmd = parts[0]
-                args = parts[1:]
-                
-                if cmd == 'exit':
-                    print("До свидания!")
+                if not self.execute(cmd_line):
                     break
-                
-                elif cmd == 'help':
-                    self.show_help()
-                
-                elif cmd == 'ls':
-                    path = None
-                    for arg in args:
-                        if not arg.startswith('-'):
-                            path = arg
-                    self.ls(path, '-l' in args)
-                
-                elif cmd == 'cd':
-                    if args:
-                        self.cd(args[0])
-                
-                elif cmd == 'chdir':
-                    if args:
-                        self.chdir(args[0])
-                
-                elif cmd == 'mkdir':
-                    if args:
-                        self.mkdir(args[0])
-                
-                elif cmd == 'rmdir':
-                    if args:
-                        self.rmdir(args[0])
-                
-                elif cmd == 'cat':
-                    if args:
-                        self.cat(args[0])
-                
-                elif cmd == 'cp':
-                    if len(args) >= 2:
-                        self.cp(args[0], args[1], '-r' in args)
-                
-                elif cmd == 'mv':
-                    if len(args) >= 2:
-                        self.mv(args[0], args[1])
-                
-                elif cmd == 'rm':
-                    if args:
-                        path = args[-1] if not args[-1].startswith('-') else args[0]
-                        self.rm(path, '-r' in args)
-                
-                elif cmd == 'zip':
-                    if args:
-                        source = args[0]
-                        archive_name = args[1] if len(args) > 1 else None
-                        self.zip_archive(source, archive_name)
-                
-                elif cmd == 'unzip':
-                    if args:
-                        archive_name = args[0]
-                        extract_path = args[1] if len(args) > 1 else None
-                        self.unzip_archive(archive_name, extract_path)
-                
-                elif cmd == 'tar':
-                    if args:
-                        source = args[0]
-                        archive_name = args[1] if len(args) > 1 else None
-                        self.tar_archive(source, archive_name)
-                
-                elif cmd == 'untar':
-                    if args:
-                        archive_name = args[0]
-                        extract_path = args[1] if len(args) > 1 else None
-                        self.untar_archive(archive_name, extract_path)
-                
-                elif cmd == 'grep':
-                    if args:
-                        pattern = args[0]
-                        filepath = None
-                        recursive = '-r' in args
-                        ignore_case = '-i' in args
-                        
-                        for arg in args[1:]:
-                            if not arg.startswith('-'):
-                                filepath = arg
-                                break
-                        
-                        self.grep(pattern, filepath, recursive, ignore_case)
-                
-                elif cmd == 'history':
-                    count = int(args[0]) if args else 10
-                    self.history_cmd(count)
-                
-                elif cmd == 'undo':
-                    self.undo_cmd()
-                
-                else:
-                    print("Неизвестная команда. Введите 'help' для справки.")
-            
             except KeyboardInterrupt:
                 print("Программа прервана (Ctrl+C)")
                 break
             except Exception as e:
                 print(f"Ошибка: {e}")
+        
+        self.history.trash.stop_gc()
+        self.history.close()
+
+    def execute(self, cmd_line):
+        # Выполняет одну строку; False — команда exit
+        if not cmd_line:
+            return True
+        
+        parts = cmd_line.split()
+        cmd = parts[0]
+        args = parts[1:]
+        
+        if cmd == 'exit':
+            print("До свидания!")
+            return False
+        
+        elif cmd == 'help':
+            self.show_help()
+        
+        elif cmd == 'ls':
+            path = None
+            for arg in args:
+                if not arg.startswith('-'):
+                    path = arg
+            self.ls(path, '-l' in args)
+        
+        elif cmd == 'cd':
+            if args:
+                self.cd(args[0])
+        
+        elif cmd == 'chdir':
+            if args:
+                self.chdir(args[0])
+        
+        elif cmd == 'mkdir':
+            if args:
+                self.mkdir(args[0])
+        
+        elif cmd == 'rmdir':
+            if args:
+                self.rmdir(args[0])
+        
+        elif cmd == 'cat':
+            if args:
+                self.cat(args[0])
+        
+        elif cmd == 'cp':
+            paths = [arg for arg in args if not arg.startswith('-')]
+            if len(paths) >= 2:
+                self.cp(paths[0], paths[1], '-r' in args)
+        
+        elif cmd == 'mv':
+            if len(args) >= 2:
+                self.mv(args[0], args[1])
+        
+        elif cmd == 'rm':
+            paths = [arg for arg in args if not arg.startswith('-')]
+            # rm a b c — одна транзакция, undo вернёт всё сразу
+            with self.history.journal.transaction(cmd_line):
+                for path in paths:
+                    self.rm(path, '-r' in args)
+        
+        elif cmd == 'zip':
+            if args:
+                source = args[0]
+                archive_name = args[1] if len(args) > 1 else None
+                self.zip_archive(source, archive_name)
+        
+        elif cmd == 'unzip':
+            if args:
+                archive_name = args[0]
+                extract_path = args[1] if len(args) > 1 else None
+                self.unzip_archive(archive_name, extract_path)
+        
+        elif cmd == 'tar':
+            if args:
+                source = args[0]
+                archive_name = args[1] if len(args) > 1 else None
+                self.tar_archive(source, archive_name)
+        
+        elif cmd == 'untar':
+            if args:
+                archive_name = args[0]
+                extract_path = args[1] if len(args) > 1 else None
+                self.untar_archive(archive_name, extract_path)
+        
+        elif cmd == 'grep':
+            if args:
+                pattern = args[0]
+                filepath = None
+                recursive = '-r' in args
+                ignore_case = '-i' in args
+                
+                for arg in args[1:]:
+                    if not arg.startswith('-'):
+                        filepath = arg
+                        break
+                
+                self.grep(pattern, filepath, recursive, ignore_case)
+        
+        elif cmd == 'history':
+            if args and args[0] == 'search':
+                self.history_search(args[1:])
+            elif args and args[0] == 'isearch':
+                self.history_isearch()
+            else:
+                count = int(args[0]) if args else 10
+                self.history_cmd(count)
+        
+        elif cmd == 'undo':
+            self.undo_cmd()
+        
+        elif cmd == 'redo':
+            self.redo_cmd()
+        
+        elif cmd == 'trash':
+            self.trash_cmd(args)
+        
+        else:
+            print("Неизвестная команда. Введите 'help' для справки.")
+        
+        return True
 
     def show_help(self):
         help_text = """
@@ -582,7 +772,7 @@ class MiniShell:
   cat [file]           - Показать содержимое файла
   cp [-r] src dst      - Копировать файл/папку (-r для рекурсии)
   mv src dst           - Переместить/переименовать
-  rm [-r] path         - Удалить файл/папку (-r для рекурсии)
+  rm [-r] path ...     - Удалить файлы/папки (-r для рекурсии)
   zip source [name]    - Создать ZIP архив
   unzip archive [path] - Распаковать ZIP
   tar source [name]    - Создать TAR.GZ архив
@@ -591,7 +781,14 @@ class MiniShell:
     -r  рекурсивный поиск в подкаталогах
     -i  игнорировать регистр
   history [count]      - Показать последние N команд (по умолчанию 10)
-  undo                 - Отменить последнюю операцию (cp/mv/rm)
+  history search [text] [-e regex] [-t type] [-p path] [--since date] [--until date] [-n N]
+                       - Поиск по истории (--prefix — команды, начинающиеся с text)
+  history isearch      - Поиск по мере ввода; номер результата — выполнить команду
+  undo                 - Отменить последнюю операцию (cp/mv/rm/rmdir/mkdir/unzip/untar/zip/tar)
+  redo                 - Повторить отменённую операцию
+  trash [list]         - Содержимое корзины (id, время удаления, размер, исходный путь)
+  trash restore id [path] - Восстановить объект из корзины
+  trash purge [id ...] - Очистить корзину целиком или удалить отдельные объекты
   help                 - Эта справка
   exit                 - Выход из программы
 """
@@ -0,0 +1,176 @@
+import re
+import json
+import sqlite3
+from functools import lru_cache
+
+
+# Аргументы команд, в которых лежат пути
+PATH_ARGS = ('path', 'source', 'dest', 'archive')
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern):
+    return re.compile(pattern)
+
+
+def _regexp(pattern, value):
+    return value is not None and _compile(pattern).search(value) is not None
+
+
+class HistoryIndex:
+    # Индекс истории в SQLite рядом с .history (.history.idx). Его всегда можно пересобрать из журнала,
+    # поэтому запись без fsync. Поиск по подстроке идёт через FTS5 с триграммами,
+    # если SQLite собран без них — обычным LIKE по таблице.
+
+    def __init__(self, path='.history.idx', max_entries=1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.create_function('regexp', 2, _regexp, deterministic=True)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=OFF')
+        self._create_schema()
+        self._added = 0
+
+    def _create_schema(self):
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT,
+                command TEXT COLLATE NOCASE,
+                type TEXT,
+                paths TEXT,
+                entry TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_timestamp ON entries(timestamp);
+            CREATE INDEX IF NOT EXISTS entries_type ON entries(type, id);
+            CREATE INDEX IF NOT EXISTS entries_command ON entries(command);
+        ''')
+        self.fts = self._create_fts()
+
+    def _create_fts(self):
+        try:
+            self.conn.executescript('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    command, content='entries', content_rowid='id', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO entries_fts(entries_fts, rowid, command) VALUES ('delete', old.id, old.command);
+                END;
+            ''')
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    @staticmethod
+    def _row(entry):
+        args = entry.get('args') or {}
+        paths = '\n'.join(str(args[key]) for key in PATH_ARGS if isinstance(args, dict) and args.get(key))
+        return (
+            entry.get('timestamp'), entry.get('command') or '', entry.get('type'), paths,
+            json.dumps(entry, ensure_ascii=False),
+        )
+
+    def add(self, entry):
+        self.add_many([entry])
+
+    def add_many(self, entries):
+        rows = [self._row(entry) for entry in entries]
+        if not rows:
+            return
+        with self.conn:
+            last_id = self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM entries').fetchone()[0]
+            self.conn.executemany(
+                'INSERT INTO entries (timestamp, command, type, paths, entry) VALUES (?, ?, ?, ?, ?)', rows
+            )
+            # Одним запросом, а не триггером на каждую строку: на больших пачках в разы быстрее
+            if self.fts:
+                self.conn.execute(
+                    'INSERT INTO entries_fts(rowid, command) SELECT id, command FROM entries WHERE id > ?', (last_id,)
+                )
+        self._added += len(rows)
+        if self._added >= 1024:
+            self._added = 0
+            self.prune()
+
+    def prune(self):
+        # Оставляем не больше max_entries последних записей
+        with self.conn:
+            self.conn.execute(
+                'DELETE FROM entries WHERE id <= (SELECT MAX(id) FROM entries) - ?', (self.max_entries,)
+            )
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def last_timestamp(self):
+        row = self.conn.execute('SELECT timestamp FROM entries ORDER BY id DESC LIMIT 1').fetchone()
+        return row[0] if row else None
+
+    def sync_from(self, log):
+        # Досылаем в индекс записи журнала, сделанные после последней проиндексированной
+        # (например, если прошлый запуск упал между записью в журнал и в индекс)
+        last = self.last_timestamp()
+        new = []
+        for entry in log.reverse():
+            if last is not None and (entry.get('timestamp') or '') <= last:
+                break
+            new.append(entry)
+        new.reverse()
+        self.add_many(new)
+        return len(new)
+
+    def rebuild(self, log):
+        # Удаляем таблицы целиком: DELETE дёргал бы триггер FTS на каждую строку
+        self.conn.executescript('DROP TABLE IF EXISTS entries_fts; DROP TABLE IF EXISTS entries;')
+        self._create_schema()
+        self.add_many(list(log))
+
+    def search(self, text=None, regex=None, cmd_type=None, path=None, since=None, until=None, limit=20):
+        # since включительно, until — не включая; времена — строки ISO, как в записях истории.
+        # Результат — от новых к старым
+        where = []
+        params = []
+        if text:
+            if self.fts and len(text) >= 3:
+                where.append('id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)')
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                where.append("command LIKE ? ESCAPE '\\'")
+                params.append(f'%{escaped}%')
+        if cmd_type:
+            where.append('type = ?')
+            params.append(cmd_type)
+        if path:
+            where.append('instr(paths, ?) > 0')
+            params.append(path)
+        if since:
+            where.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            where.append('timestamp < ?')
+            params.append(until)
+        if regex:
+            _compile(regex)  # ошибка в выражении — сразу, а не внутри SQLite
+            where.append('command REGEXP ?')
+            params.append(regex)
+        sql = 'SELECT entry FROM entries'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+    def prefix(self, prefix, limit=10):
+        # Разные команды, начинающиеся с prefix, от последней к ранним (reverse-i-search).
+        # Диапазон по индексу entries_command вместо LIKE, чтобы не экранировать % и _
+        rows = self.conn.execute(
+            'SELECT command, MAX(id) AS last FROM entries WHERE command >= ? AND command < ? '
+            'GROUP BY command ORDER BY last DESC LIMIT ?',
+            (prefix, prefix + '\U0010ffff', limit),
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+
+
+class HistoryLog:
+    # Журнал в формате JSON lines: одна запись — одна строка, новые записи только дописываются в конец.
+    # Когда файл вырастает больше max_bytes, он переименовывается в .1 (.1 -> .2 и т.д.),
+    # старше keep сегментов удаляются.
+
+    BLOCK = 64 * 1024
+
+    def __init__(self, path='.history', max_bytes=1024 * 1024, keep=5, sync_every=32, sync_interval=1.0):
+        # Файл открывается лениво — после chdir относительный путь указывал бы уже в другой каталог
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._size = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._migrate()
+        self._recover()
+
+    def _migrate(self):
+        # Старый формат .history — один JSON-массив, переписываем его построчно
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            head = f.read(1024).lstrip()
+        if not head.startswith(b'['):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (ValueError, UnicodeDecodeError):
+            entries = []
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _recover(self):
+        # Если процесс упал посреди записи, последняя строка оборвана — отрезаем её
+        if not os.path.exists(self.path):
+            self._size = 0
+            return
+        with open(self.path, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                self._size = 0
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                self._size = size
+                return
+            pos = size
+            while pos > 0:
+                start = max(0, pos - self.BLOCK)
+                f.seek(start)
+                block = f.read(pos - start)
+                cut = block.rfind(b'\n')
+                if cut != -1:
+                    pos = start + cut + 1
+                    break
+                pos = start
+            f.truncate(pos)
+            self._size = pos
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    def append(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        f = self._open()
+        # flush отдаёт строку ОС сразу (падение процесса её не потеряет),
+        # а дорогой fsync делается раз в sync_every записей или sync_interval секунд
+        f.write(line)
+        f.flush()
+        self._size += len(line.encode('utf-8'))
+        self._unsynced += 1
+        now = time.monotonic()
+        if self._unsynced >= self.sync_every or now - self._last_sync >= self.sync_interval:
+            self.sync()
+        if self._size >= self.max_bytes:
+            self.rotate()
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def segments(self):
+        # Файлы журнала от самого нового к самому старому
+        result = [self.path]
+        i = 1
+        while os.path.exists(f"{self.path}.{i}"):
+            result.append(f"{self.path}.{i}")
+            i += 1
+        return result
+
+    def rotate(self):
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        segments = self.segments()
+        for i in range(len(segments) - 1, 0, -1):
+            if i >= self.keep:
+                os.remove(segments[i])
+            else:
+                os.replace(segments[i], f"{self.path}.{i + 1}")
+        if self.keep > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._size = 0
+
+    def tail(self, count=10):
+        # Читаем файлы с конца блоками, пока не наберём count записей — остальной журнал не трогаем
+        if count <= 0:
+            return []
+        entries = []
+        for entry in self.reverse():
+            entries.append(entry)
+            if len(entries) == count:
+                break
+        entries.reverse()
+        return entries
+
+    def reverse(self):
+        # Все записи от новых к старым
+        if self._file is not None:
+            self._file.flush()
+        for path in self.segments():
+            if os.path.exists(path):
+                yield from self._read_backwards(path)
+
+    def _read_backwards(self, path):
+        with open(path, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            rest = b''
+            while pos > 0:
+                start = max(0, pos - self.BLOCK)
+                f.seek(start)
+                lines = (f.read(pos - start) + rest).split(b'\n')
+                pos = start
+                # Первая строка блока может быть неполной — оставляем её до следующего блока
+                rest = lines.pop(0) if pos > 0 else b''
+                for line in reversed(lines):
+                    entry = self._parse(line)
+                    if entry is not None:
+                        yield entry
+
+    def __iter__(self):
+        # Все записи от старых к новым
+        if self._file is not None:
+            self._file.flush()
+        for path in reversed(self.segments()):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                for line in f:
+                    entry = self._parse(line)
+                    if entry is not None:
+                        yield entry
+
+    @staticmethod
+    def _parse(line):
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            return None
@@ -0,0 +1,234 @@
+import os
+import json
+import uuid
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Операции, которые умеет отменять и повторять журнал:
+#   {'kind': 'create', 'paths': [...]}          — созданы новые файлы/каталоги (cp, mkdir, unzip, untar, zip, tar)
+#   {'kind': 'delete', 'path': p, 'trash_id': id} — объект перенесён в корзину (rm, rmdir, перезапись)
+#   {'kind': 'move', 'src': a, 'dst': b}          — mv
+# Отмена create переносит пути в корзину, повтор возвращает их оттуда, так что и отмена, и повтор —
+# это переименования без повторного копирования и без обхода файловой системы.
+
+JOURNAL_MAX_DEPTH = 100
+JOURNAL_COMPACT_EVERY = 1000
+
+
+class Journal:
+    # Журнал на диске в формате JSON lines. Команда — транзакция: запись begin пишется до выполнения,
+    # затем по записи do на каждую выполненную операцию и commit в конце. undo/redo тоже дописываются,
+    # поэтому при запуске стеки отмены восстанавливаются одним чтением файла.
+    # Когда записей становится много, файл заменяется одной записью snapshot с текущими стеками.
+
+    def __init__(self, path='.journal', trash=None, max_depth=JOURNAL_MAX_DEPTH):
+        # Абсолютный путь: файл открывается при первой записи, а chdir не должен уносить журнал в другой каталог
+        self.path = os.path.abspath(path)
+        self.trash = trash
+        self.max_depth = max_depth
+        self.done = []
+        self.undone = []
+        self._current = None
+        self._records = 0
+        self._file = None
+        self._replay()
+        if self._records > JOURNAL_COMPACT_EVERY:
+            self.compact()
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        open_txs = {}
+        good = 0
+        with open(self.path, 'r+b') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Оборванная последняя строка после падения — отрезаем, чтобы следующая запись не склеилась с ней
+                    f.truncate(good)
+                    break
+                good += len(line)
+                try:
+                    record = json.loads(line)
+                except (ValueError, UnicodeDecodeError):
+                    continue
+                self._records += 1
+                op = record.get('op')
+                if op == 'snapshot':
+                    self.done = record['done']
+                    self.undone = record['undone']
+                elif op == 'begin':
+                    open_txs[record['tx']] = {
+                        'id': record['tx'], 'command': record.get('command'),
+                        'timestamp': record.get('timestamp'), 'ops': [],
+                    }
+                elif op == 'do' and record['tx'] in open_txs:
+                    open_txs[record['tx']]['ops'].append(record['data'])
+                elif op == 'commit' and record['tx'] in open_txs:
+                    self._push_done(open_txs.pop(record['tx']))
+                elif op == 'undo' and self.done and self.done[-1]['id'] == record['tx']:
+                    tx = self.done.pop()
+                    tx['ops'] = record['ops']
+                    self.undone.append(tx)
+                elif op == 'redo' and self.undone and self.undone[-1]['id'] == record['tx']:
+                    tx = self.undone.pop()
+                    tx['ops'] = record['ops']
+                    self.done.append(tx)
+        # Команда, прерванная посередине: то, что успело выполниться, записано в do — его можно отменить
+        for tx in open_txs.values():
+            self._push_done(tx)
+
+    def _push_done(self, tx):
+        if not tx['ops']:
+            return
+        self.done.append(tx)
+        self.undone.clear()
+        if len(self.done) > self.max_depth:
+            del self.done[:len(self.done) - self.max_depth]
+
+    def _write(self, record, sync=False):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self._records += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def compact(self):
+        self.close()
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'op': 'snapshot', 'done': self.done, 'undone': self.undone}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._records = 1
+
+    @contextmanager
+    def transaction(self, command):
+        # Вложенные транзакции сливаются во внешнюю: rm a b c — одна запись в стеке отмены
+        if self._current is not None:
+            yield self._current
+            return
+        tx = {'id': uuid.uuid4().hex[:12], 'command': command, 'timestamp': datetime.now().isoformat(), 'ops': []}
+        self._write({'op': 'begin', 'tx': tx['id'], 'command': command, 'timestamp': tx['timestamp']})
+        self._current = tx
+        try:
+            yield tx
+        finally:
+            self._current = None
+            self._write({'op': 'commit', 'tx': tx['id']}, sync=True)
+            self._push_done(tx)
+            if self._records > JOURNAL_COMPACT_EVERY:
+                self.compact()
+
+    def record(self, command, op):
+        with self.transaction(command) as tx:
+            tx['ops'].append(op)
+            self._write({'op': 'do', 'tx': tx['id'], 'data': op})
+
+    def undo(self):
+        if not self.done:
+            return None
+        tx = self.done[-1]
+        self._check(reversed(tx['ops']), undo=True)
+        ops = [self._undo_op(dict(op)) for op in reversed(tx['ops'])]
+        ops.reverse()
+        self.done.pop()
+        tx['ops'] = ops
+        self.undone.append(tx)
+        self._write({'op': 'undo', 'tx': tx['id'], 'ops': ops}, sync=True)
+        return tx
+
+    def redo(self):
+        if not self.undone:
+            return None
+        tx = self.undone[-1]
+        self._check(tx['ops'], undo=False)
+        ops = [self._redo_op(dict(op)) for op in tx['ops']]
+        self.undone.pop()
+        tx['ops'] = ops
+        self.done.append(tx)
+        self._write({'op': 'redo', 'tx': tx['id'], 'ops': ops}, sync=True)
+        return tx
+
+    def _check(self, ops, undo):
+        # Проверяем всю транзакцию до первого изменения, чтобы не остановиться на середине.
+        # Операции проверяются по очереди с учётом того, что сделают предыдущие (cp поверх файла —
+        # это delete и create одного пути)
+        appeared, gone = set(), set()
+
+        def exists(path):
+            return path in appeared or (path not in gone and os.path.lexists(path))
+
+        def put(path):
+            appeared.add(path)
+            gone.discard(path)
+
+        def take(path):
+            gone.add(path)
+            appeared.discard(path)
+
+        for op in ops:
+            kind = op['kind']
+            if kind == 'move':
+                src, dst = (op['dst'], op['src']) if undo else (op['src'], op['dst'])
+                if not exists(src):
+                    raise FileNotFoundError(f"Не найден: {src}")
+                if exists(dst):
+                    raise FileExistsError(f"Уже существует: {dst}")
+                take(src)
+                put(dst)
+            elif kind == 'delete':
+                if undo:
+                    self.trash.get(op['trash_id'])
+                    if exists(op['path']):
+                        raise FileExistsError(f"Уже существует: {op['path']}")
+                    put(op['path'])
+                else:
+                    if not exists(op['path']):
+                        raise FileNotFoundError(f"Не найден: {op['path']}")
+                    take(op['path'])
+            elif kind == 'create':
+                if undo:
+                    for path in op['paths']:
+                        take(path)
+                    continue
+                for path, trash_id in zip(op['paths'], op.get('trash_ids', [])):
+                    if trash_id is not None:
+                        self.trash.get(trash_id)
+                        if exists(path):
+                            raise FileExistsError(f"Уже существует: {path}")
+                        put(path)
+
+    def _undo_op(self, op):
+        kind = op['kind']
+        if kind == 'create':
+            op['trash_ids'] = [
+                self.trash.put(path)['id'] if os.path.lexists(path) else None for path in op['paths']
+            ]
+        elif kind == 'delete':
+            self.trash.restore(op['trash_id'], op['path'])
+        elif kind == 'move':
+            shutil.move(op['dst'], op['src'])
+        return op
+
+    def _redo_op(self, op):
+        kind = op['kind']
+        if kind == 'create':
+            for path, trash_id in zip(op['paths'], op.get('trash_ids', [])):
+                if trash_id is not None:
+                    self.trash.restore(trash_id, path)
+            op['trash_ids'] = []
+        elif kind == 'delete':
+            op['trash_id'] = self.trash.put(op['path'])['id']
+        elif kind == 'move':
+            shutil.move(op['src'], op['dst'])
+        return op
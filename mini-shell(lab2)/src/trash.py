@@ -0,0 +1,222 @@
+import os
+import json
+import uuid
+import errno
+import shutil
+import threading
+from datetime import datetime, timedelta
+
+
+TRASH_MAX_BYTES = 1024 ** 3
+TRASH_MAX_AGE = timedelta(days=30)
+TRASH_GC_INTERVAL = 60
+
+
+class Trash:
+    # Каждый удалённый объект лежит в своей папке .trash/<id>/ вместе с manifest.json,
+    # поэтому одинаковые имена из разных мест не перезаписывают друг друга.
+    # На той же файловой системе объект переносится через os.rename — мгновенно при любом размере.
+    # Индекс (id -> запись манифеста) держится в памяти; размеры каталогов считает фоновый поток,
+    # он же удаляет самые старые записи при превышении max_bytes и записи старше max_age.
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, path='.trash', max_bytes=TRASH_MAX_BYTES, max_age=TRASH_MAX_AGE):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load_index(self):
+        # Папки без manifest.json (старый формат корзины) пропускаются
+        index = {}
+        for name in os.listdir(self.path):
+            try:
+                with open(os.path.join(self._entry_dir(name), self.MANIFEST), 'r', encoding='utf-8') as f:
+                    index[name] = json.load(f)
+            except (KeyError, OSError, ValueError):
+                continue
+        return index
+
+    def _new_id(self):
+        # Сортируются по времени удаления
+        return datetime.now().strftime('%Y%m%d%H%M%S%f') + '-' + uuid.uuid4().hex[:6]
+
+    def _entry_dir(self, entry_id):
+        if not entry_id or os.sep in entry_id or entry_id in ('.', '..'):
+            raise KeyError(entry_id)
+        return os.path.join(self.path, entry_id)
+
+    def put(self, path):
+        path = os.path.abspath(path)
+        if not os.path.lexists(path):
+            raise FileNotFoundError(f"Файл не существует: {path}")
+        entry_id = self._new_id()
+        entry_dir = self._entry_dir(entry_id)
+        os.makedirs(entry_dir)
+        is_dir = os.path.isdir(path) and not os.path.islink(path)
+        entry = {
+            'id': entry_id,
+            'name': os.path.basename(path),
+            'original_path': path,
+            'deleted_at': datetime.now().isoformat(),
+            'is_dir': is_dir,
+            # Размер файла известен сразу, каталог посчитает фоновый поток
+            'size': None if is_dir else os.lstat(path).st_size,
+        }
+        self._write_manifest(entry_dir, entry)
+        try:
+            entry['copied'] = _move(path, os.path.join(entry_dir, entry['name']))
+        except BaseException:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            raise
+        if entry['copied']:
+            self._write_manifest(entry_dir, entry)
+        with self._lock:
+            self._index[entry_id] = entry
+        self._wake.set()
+        return entry
+
+    def _write_manifest(self, entry_dir, entry):
+        tmp = os.path.join(entry_dir, self.MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, os.path.join(entry_dir, self.MANIFEST))
+
+    def get(self, entry_id):
+        with self._lock:
+            return dict(self._index[entry_id])
+
+    def item_path(self, entry):
+        return os.path.join(self.path, entry['id'], entry['name'])
+
+    def entries(self):
+        # От старых к новым
+        with self._lock:
+            return [dict(self._index[entry_id]) for entry_id in sorted(self._index)]
+
+    def total_size(self):
+        with self._lock:
+            return sum(entry['size'] or 0 for entry in self._index.values())
+
+    def restore(self, entry_id, dest=None):
+        with self._lock:
+            entry = self._index[entry_id]
+            target = os.path.abspath(dest or entry['original_path'])
+            if os.path.lexists(target):
+                raise FileExistsError(f"Уже существует: {target}")
+            item = self.item_path(entry)
+            if not os.path.lexists(item):
+                raise FileNotFoundError(f"Объект {entry_id} пропал из корзины")
+            # Убираем из индекса до переноса, чтобы сборщик мусора его уже не трогал
+            del self._index[entry_id]
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _move(item, target)
+        except BaseException:
+            with self._lock:
+                self._index[entry_id] = entry
+            raise
+        shutil.rmtree(self._entry_dir(entry_id), ignore_errors=True)
+        return target
+
+    def remove(self, entry_id):
+        # Удалить из корзины насовсем
+        with self._lock:
+            del self._index[entry_id]
+        shutil.rmtree(self._entry_dir(entry_id), ignore_errors=True)
+
+    def purge(self):
+        with self._lock:
+            ids = list(self._index)
+            self._index.clear()
+        for entry_id in ids:
+            shutil.rmtree(self._entry_dir(entry_id), ignore_errors=True)
+        return ids
+
+    def _measure(self):
+        # Досчитываем размеры каталогов без блокировки — обход может быть долгим
+        with self._lock:
+            pending = [entry for entry in self._index.values() if entry['size'] is None]
+        for entry in pending:
+            size = _tree_size(self.item_path(entry))
+            with self._lock:
+                if entry['id'] not in self._index:
+                    continue
+                entry['size'] = size
+            self._write_manifest(self._entry_dir(entry['id']), entry)
+
+    def collect(self, now=None):
+        # Удаляет записи старше max_age, затем самые старые, пока корзина больше max_bytes
+        self._measure()
+        if now is None:
+            now = datetime.now()
+        victims = []
+        with self._lock:
+            ordered = sorted(self._index.values(), key=lambda e: e['deleted_at'])
+            total = sum(entry['size'] or 0 for entry in ordered)
+            for entry in ordered:
+                expired = self.max_age is not None and now - datetime.fromisoformat(entry['deleted_at']) > self.max_age
+                if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                    break
+                victims.append(entry['id'])
+                total -= entry['size'] or 0
+                del self._index[entry['id']]
+        for entry_id in victims:
+            shutil.rmtree(self._entry_dir(entry_id), ignore_errors=True)
+        return victims
+
+    def start_gc(self, interval=TRASH_GC_INTERVAL):
+        # Фоновый поток-демон: просыпается раз в interval секунд или сразу после put
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._gc_loop, args=(interval,), name='trash-gc', daemon=True)
+        self._thread.start()
+
+    def stop_gc(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def _gc_loop(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.collect()
+            except OSError:
+                pass
+            self._wake.wait(interval)
+            self._wake.clear()
+
+
+def _tree_size(path):
+    if not os.path.isdir(path) or os.path.islink(path):
+        return os.lstat(path).st_size if os.path.lexists(path) else 0
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _move(src, dst):
+    # True, если пришлось копировать (другое устройство)
+    try:
+        os.rename(src, dst)
+        return False
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    shutil.move(src, dst)
+    return True
@@ -4,15 +4,22 @@ import tempfile
 import shutil
 from src.commands import MiniShell
 
-class TestMiniShell(unittest.TestCase):
+class ShellTestCase(unittest.TestCase):
     
     def setUp(self):
+        # История, корзина и журнал создаются в текущем каталоге — запускаем оболочку во временном
+        self.old_cwd = os.getcwd()
         self.test_dir = tempfile.mkdtemp()
+        os.chdir(self.test_dir)
         self.shell = MiniShell()
         self.shell.current_dir = self.test_dir
     
     def tearDown(self):
+        self.shell.history.close()
+        os.chdir(self.old_cwd)
         shutil.rmtree(self.test_dir, ignore_errors=True)
+
+class TestMiniShell(ShellTestCase):
     
     def test_mkdir(self):
         self.shell.mkdir('test_folder')
@@ -59,6 +66,21 @@ class TestMiniShell(unittest.TestCase):
         self.shell.rm('test.txt')
         self.assertFalse(os.path.exists(test_file))
     
+    def test_undo_rm_and_rmdir(self):
+        test_file = os.path.join(self.test_dir, 'test.txt')
+        with open(test_file, 'w') as f:
+            f.write('test')
+        folder_path = os.path.join(self.test_dir, 'test_folder')
+        os.makedirs(os.path.join(folder_path, 'inner'))
+        
+        self.shell.rm('test.txt')
+        self.shell.rmdir('test_folder')
+        self.assertFalse(os.path.exists(folder_path))
+        self.shell.undo_cmd()
+        self.assertTrue(os.path.isdir(os.path.join(folder_path, 'inner')))
+        self.shell.undo_cmd()
+        self.assertTrue(os.path.exists(test_file))
+    
     def test_cd_change_directory(self):
         subfolder = os.path.join(self.test_dir, 'subfolder')
         os.makedirs(subfolder)
@@ -73,5 +95,93 @@ class TestMiniShell(unittest.TestCase):
         
         self.shell.ls()
 
+
+class TestUndoRedo(ShellTestCase):
+    
+    def write(self, name, content='test'):
+        with open(os.path.join(self.test_dir, name), 'w') as f:
+            f.write(content)
+    
+    def read(self, name):
+        with open(os.path.join(self.test_dir, name)) as f:
+            return f.read()
+    
+    def test_undo_redo_mkdir(self):
+        self.shell.mkdir('a/b')
+        self.shell.undo_cmd()
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'a')))
+        self.shell.redo_cmd()
+        self.assertTrue(os.path.isdir(os.path.join(self.test_dir, 'a', 'b')))
+    
+    def test_undo_cp_overwrite(self):
+        self.write('src.txt', 'new')
+        self.write('dst.txt', 'old')
+        self.shell.cp('src.txt', 'dst.txt')
+        self.assertEqual(self.read('dst.txt'), 'new')
+        self.shell.undo_cmd()
+        self.assertEqual(self.read('dst.txt'), 'old')
+        self.shell.redo_cmd()
+        self.assertEqual(self.read('dst.txt'), 'new')
+    
+    def test_undo_cp_dir_into_existing(self):
+        os.makedirs(os.path.join(self.test_dir, 'src', 'sub'))
+        self.write('src/sub/x.txt')
+        os.makedirs(os.path.join(self.test_dir, 'dst'))
+        self.write('dst/keep.txt')
+        self.shell.execute('cp -r src dst')
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'dst', 'sub', 'x.txt')))
+        self.shell.undo_cmd()
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'dst', 'sub')))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'dst', 'keep.txt')))
+    
+    def test_rm_many_is_one_transaction(self):
+        for name in ('a.txt', 'b.txt', 'c.txt'):
+            self.write(name)
+        self.shell.execute('rm a.txt b.txt c.txt')
+        self.assertEqual(len(self.shell.history.journal.done), 1)
+        self.shell.undo_cmd()
+        for name in ('a.txt', 'b.txt', 'c.txt'):
+            self.assertTrue(os.path.exists(os.path.join(self.test_dir, name)))
+    
+    def test_undo_mv(self):
+        self.write('a.txt', 'data')
+        self.shell.mv('a.txt', 'b.txt')
+        self.shell.undo_cmd()
+        self.assertEqual(self.read('a.txt'), 'data')
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'b.txt')))
+    
+    def test_undo_unzip(self):
+        os.makedirs(os.path.join(self.test_dir, 'data'))
+        self.write('data/x.txt')
+        self.shell.zip_archive('data', 'data.zip')
+        self.shell.unzip_archive('data.zip', 'out')
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'out', 'data', 'x.txt')))
+        self.shell.undo_cmd()
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'out')))
+        self.shell.undo_cmd()
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'data.zip')))
+    
+    def test_undo_after_restart(self):
+        self.write('a.txt')
+        self.shell.rm('a.txt')
+        self.shell.history.close()
+        self.shell = MiniShell()
+        self.shell.current_dir = self.test_dir
+        self.shell.undo_cmd()
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'a.txt')))
+    
+    def test_undo_after_chdir_and_restart(self):
+        os.makedirs(os.path.join(self.test_dir, 'sub'))
+        self.write('sub/a.txt')
+        self.shell.chdir('sub')
+        self.shell.rm('a.txt')
+        self.shell.history.close()
+        os.chdir(self.test_dir)
+        self.shell = MiniShell()
+        self.shell.current_dir = self.test_dir
+        self.shell.undo_cmd()
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'sub', 'a.txt')))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'sub', '.journal')))
+
 if __name__ == '__main__':
     unittest.main()
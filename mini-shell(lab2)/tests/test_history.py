@@ -0,0 +1,132 @@
+import unittest
+import os
+import json
+import tempfile
+import shutil
+from src.history_log import HistoryLog
+from src.history_index import HistoryIndex
+
+class TestHistoryLog(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, '.history')
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_append_and_tail(self):
+        log = HistoryLog(self.path)
+        for i in range(100):
+            log.append({'command': f'ls {i}'})
+        self.assertEqual([e['command'] for e in log.tail(3)], ['ls 97', 'ls 98', 'ls 99'])
+        self.assertEqual(len(log.tail(1000)), 100)
+        log.close()
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 100)
+    
+    def test_tail_across_blocks(self):
+        log = HistoryLog(self.path)
+        log.BLOCK = 16
+        for i in range(20):
+            log.append({'command': 'x' * i})
+        self.assertEqual([len(e['command']) for e in log.tail(5)], [15, 16, 17, 18, 19])
+        log.close()
+    
+    def test_relative_path_survives_chdir(self):
+        old_cwd = os.getcwd()
+        os.makedirs(os.path.join(self.test_dir, 'sub'))
+        os.chdir(self.test_dir)
+        try:
+            log = HistoryLog('.history')
+            os.chdir('sub')
+            log.append({'command': 'ls'})
+            log.close()
+        finally:
+            os.chdir(old_cwd)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'sub', '.history')))
+    
+    def test_torn_last_line(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'command': 'ok'}) + '\n' + '{"command": "bro')
+        log = HistoryLog(self.path)
+        log.append({'command': 'next'})
+        log.close()
+        self.assertEqual([e['command'] for e in log], ['ok', 'next'])
+    
+    def test_migrate_json_array(self):
+        with open(self.path, 'w') as f:
+            json.dump([{'command': 'a'}, {'command': 'b'}], f, indent=2)
+        log = HistoryLog(self.path)
+        log.append({'command': 'c'})
+        self.assertEqual([e['command'] for e in log.tail(10)], ['a', 'b', 'c'])
+        log.close()
+    
+    def test_rotation(self):
+        log = HistoryLog(self.path, max_bytes=200, keep=2)
+        for i in range(100):
+            log.append({'command': f'cmd {i}'})
+        log.close()
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+        commands = [e['command'] for e in log]
+        self.assertEqual(commands[-1], 'cmd 99')
+        self.assertLess(len(commands), 100)
+        self.assertEqual([e['command'] for e in log.tail(len(commands))], commands)
+
+class TestHistoryIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.index = HistoryIndex(os.path.join(self.test_dir, '.history.idx'))
+        self.index.add_many([
+            {'timestamp': '2025-01-01T10:00:00', 'command': 'mkdir projects', 'type': 'mkdir', 'args': {'path': 'projects'}},
+            {'timestamp': '2025-01-02T10:00:00', 'command': 'cp a.txt projects', 'type': 'cp',
+             'args': {'source': 'a.txt', 'dest': 'projects'}},
+            {'timestamp': '2025-01-03T10:00:00', 'command': 'cat a.txt', 'type': 'cat', 'args': {'path': 'a.txt'}},
+            {'timestamp': '2025-01-04T10:00:00', 'command': 'cd projects', 'type': 'cd', 'args': {'path': 'projects'}},
+        ])
+    
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def commands(self, **filters):
+        return [e['command'] for e in self.index.search(**filters)]
+    
+    def test_filters(self):
+        self.assertEqual(self.commands(text='a.txt'), ['cat a.txt', 'cp a.txt projects'])
+        self.assertEqual(self.commands(text='CD'), ['cd projects'])
+        self.assertEqual(self.commands(regex=r'^c[ad]'), ['cd projects', 'cat a.txt'])
+        self.assertEqual(self.commands(cmd_type='cp'), ['cp a.txt projects'])
+        self.assertEqual(self.commands(path='projects'), ['cd projects', 'cp a.txt projects', 'mkdir projects'])
+        self.assertEqual(self.commands(since='2025-01-02', until='2025-01-04'), ['cat a.txt', 'cp a.txt projects'])
+        self.assertEqual(self.commands(text='projects', cmd_type='cd', limit=1), ['cd projects'])
+        self.assertEqual(self.commands(text='100%'), [])
+    
+    def test_prefix(self):
+        self.index.add({'timestamp': '2025-01-05T10:00:00', 'command': 'cat a.txt', 'type': 'cat'})
+        self.assertEqual(self.index.prefix('c'), ['cat a.txt', 'cd projects', 'cp a.txt projects'])
+        self.assertEqual(self.index.prefix('cp '), ['cp a.txt projects'])
+    
+    def test_sync_and_rebuild(self):
+        log = HistoryLog(os.path.join(self.test_dir, '.history'))
+        log.append({'timestamp': '2025-01-04T10:00:00', 'command': 'cd projects'})
+        log.append({'timestamp': '2025-01-05T10:00:00', 'command': 'ls'})
+        self.assertEqual(self.index.sync_from(log), 1)
+        self.assertEqual(self.index.count(), 5)
+        self.index.rebuild(log)
+        self.assertEqual(self.index.count(), 2)
+        self.assertEqual(self.commands(text='proj'), ['cd projects'])
+        log.close()
+    
+    def test_prune(self):
+        self.index.max_entries = 2
+        self.index.prune()
+        self.assertEqual(self.commands(), ['cd projects', 'cat a.txt'])
+        self.assertEqual(self.commands(text='mkdir'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+import os
+import json
+import tempfile
+import shutil
+from src.trash import Trash
+from src.journal import Journal
+
+class TestJournal(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, '.journal')
+        self.trash = Trash(os.path.join(self.test_dir, '.trash'))
+        self.journal = Journal(self.path, self.trash)
+    
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def make_file(self, name, content='test'):
+        path = os.path.join(self.test_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def reopen(self):
+        self.journal.close()
+        self.journal = Journal(self.path, self.trash)
+    
+    def test_undo_redo_create(self):
+        path = self.make_file('new.txt')
+        self.journal.record('touch new.txt', {'kind': 'create', 'paths': [path]})
+        self.assertEqual(self.journal.undo()['command'], 'touch new.txt')
+        self.assertFalse(os.path.exists(path))
+        self.journal.redo()
+        self.assertTrue(os.path.exists(path))
+        self.assertIsNone(self.journal.redo())
+    
+    def test_undo_redo_delete(self):
+        path = self.make_file('old.txt', 'data')
+        entry = self.trash.put(path)
+        self.journal.record('rm old.txt', {'kind': 'delete', 'path': path, 'trash_id': entry['id']})
+        self.journal.undo()
+        with open(path) as f:
+            self.assertEqual(f.read(), 'data')
+        self.journal.redo()
+        self.assertFalse(os.path.exists(path))
+        self.journal.undo()
+        self.assertTrue(os.path.exists(path))
+    
+    def test_undo_redo_move(self):
+        src = self.make_file('a.txt')
+        dst = os.path.join(self.test_dir, 'b.txt')
+        shutil.move(src, dst)
+        self.journal.record('mv a.txt b.txt', {'kind': 'move', 'src': src, 'dst': dst})
+        self.journal.undo()
+        self.assertTrue(os.path.exists(src))
+        self.assertFalse(os.path.exists(dst))
+        self.journal.redo()
+        self.assertTrue(os.path.exists(dst))
+    
+    def test_transaction_groups_operations(self):
+        paths = [self.make_file(f'{i}.txt') for i in range(3)]
+        with self.journal.transaction('rm 0.txt 1.txt 2.txt'):
+            for path in paths:
+                entry = self.trash.put(path)
+                self.journal.record('rm', {'kind': 'delete', 'path': path, 'trash_id': entry['id']})
+        self.assertEqual(len(self.journal.done), 1)
+        self.journal.undo()
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertIsNone(self.journal.undo())
+    
+    def test_overwrite_undo_restores_old_version(self):
+        path = self.make_file('f.txt', 'old')
+        with self.journal.transaction('cp x f.txt'):
+            entry = self.trash.put(path)
+            self.journal.record('cp', {'kind': 'delete', 'path': path, 'trash_id': entry['id']})
+            self.make_file('f.txt', 'new')
+            self.journal.record('cp', {'kind': 'create', 'paths': [path]})
+        self.journal.undo()
+        with open(path) as f:
+            self.assertEqual(f.read(), 'old')
+        self.journal.redo()
+        with open(path) as f:
+            self.assertEqual(f.read(), 'new')
+    
+    def test_failed_check_changes_nothing(self):
+        path = self.make_file('a.txt')
+        self.journal.record('touch a.txt', {'kind': 'create', 'paths': [path]})
+        self.journal.undo()
+        self.make_file('a.txt', 'other')
+        with self.assertRaises(FileExistsError):
+            self.journal.redo()
+        self.assertEqual(len(self.journal.undone), 1)
+    
+    def test_replay_after_reopen(self):
+        path = self.make_file('a.txt')
+        self.journal.record('touch a.txt', {'kind': 'create', 'paths': [path]})
+        other = self.make_file('b.txt')
+        self.journal.record('touch b.txt', {'kind': 'create', 'paths': [other]})
+        self.journal.undo()
+        self.reopen()
+        self.assertEqual([tx['command'] for tx in self.journal.done], ['touch a.txt'])
+        self.assertEqual([tx['command'] for tx in self.journal.undone], ['touch b.txt'])
+        self.journal.redo()
+        self.assertTrue(os.path.exists(other))
+    
+    def test_new_command_clears_redo(self):
+        path = self.make_file('a.txt')
+        self.journal.record('touch a.txt', {'kind': 'create', 'paths': [path]})
+        self.journal.undo()
+        self.journal.record('touch b.txt', {'kind': 'create', 'paths': [self.make_file('b.txt')]})
+        self.assertIsNone(self.journal.redo())
+    
+    def test_interrupted_transaction_is_undoable(self):
+        path = self.make_file('a.txt')
+        self.journal._write({'op': 'begin', 'tx': 't1', 'command': 'cp', 'timestamp': ''})
+        self.journal._write({'op': 'do', 'tx': 't1', 'data': {'kind': 'create', 'paths': [path]}})
+        self.reopen()
+        self.assertEqual(self.journal.undo()['command'], 'cp')
+        self.assertFalse(os.path.exists(path))
+    
+    def test_torn_line(self):
+        self.journal.record('touch a.txt', {'kind': 'create', 'paths': [self.make_file('a.txt')]})
+        self.journal.close()
+        with open(self.path, 'a') as f:
+            f.write('{"op": "beg')
+        self.reopen()
+        self.assertEqual(len(self.journal.done), 1)
+        self.journal.record('touch b.txt', {'kind': 'create', 'paths': [self.make_file('b.txt')]})
+        self.reopen()
+        self.assertEqual(len(self.journal.done), 2)
+    
+    def test_compact(self):
+        for i in range(5):
+            self.journal.record(f'touch {i}', {'kind': 'create', 'paths': [self.make_file(f'{i}.txt')]})
+        self.journal.undo()
+        self.journal.compact()
+        with open(self.path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['op'], 'snapshot')
+        self.reopen()
+        self.assertEqual(len(self.journal.done), 4)
+        self.assertEqual(len(self.journal.undone), 1)
+    
+    def test_max_depth(self):
+        self.journal.max_depth = 3
+        for i in range(5):
+            self.journal.record(f'touch {i}', {'kind': 'create', 'paths': [self.make_file(f'{i}.txt')]})
+        self.assertEqual([tx['command'] for tx in self.journal.done], ['touch 2', 'touch 3', 'touch 4'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import os
+import errno
+import tempfile
+import shutil
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+from src.trash import Trash
+
+class TestTrash(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.trash = Trash(os.path.join(self.test_dir, '.trash'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def make_file(self, name, content='test'):
+        path = os.path.join(self.test_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def test_put_and_restore(self):
+        path = self.make_file('a/data.txt', 'hello')
+        entry = self.trash.put(path)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(entry['copied'])
+        self.assertEqual(self.trash.get(entry['id'])['original_path'], path)
+        self.assertEqual(self.trash.restore(entry['id']), path)
+        with open(path) as f:
+            self.assertEqual(f.read(), 'hello')
+        self.assertEqual(self.trash.entries(), [])
+    
+    def test_same_name_does_not_clobber(self):
+        first = self.trash.put(self.make_file('a/data.txt', 'one'))
+        second = self.trash.put(self.make_file('b/data.txt', 'two'))
+        self.assertNotEqual(first['id'], second['id'])
+        self.assertEqual([e['id'] for e in self.trash.entries()], [first['id'], second['id']])
+        self.trash.restore(first['id'])
+        with open(os.path.join(self.test_dir, 'a', 'data.txt')) as f:
+            self.assertEqual(f.read(), 'one')
+    
+    def test_directory(self):
+        path = os.path.join(self.test_dir, 'folder')
+        self.make_file('folder/inner/x.txt')
+        entry = self.trash.put(path)
+        self.assertTrue(entry['is_dir'])
+        self.trash.restore(entry['id'])
+        self.assertTrue(os.path.isfile(os.path.join(path, 'inner', 'x.txt')))
+    
+    def test_restore_does_not_overwrite(self):
+        path = self.make_file('data.txt', 'old')
+        entry = self.trash.put(path)
+        self.make_file('data.txt', 'new')
+        with self.assertRaises(FileExistsError):
+            self.trash.restore(entry['id'])
+        other = os.path.join(self.test_dir, 'restored.txt')
+        self.assertEqual(self.trash.restore(entry['id'], other), other)
+    
+    def test_cross_device_fallback(self):
+        path = self.make_file('data.txt', 'far')
+        real_rename = os.rename
+        def rename(src, dst):
+            if src == path:
+                raise OSError(errno.EXDEV, 'Invalid cross-device link')
+            return real_rename(src, dst)
+        with mock.patch('src.trash.os.rename', side_effect=rename):
+            entry = self.trash.put(path)
+        self.assertTrue(entry['copied'])
+        self.assertFalse(os.path.exists(path))
+        self.trash.restore(entry['id'])
+        with open(path) as f:
+            self.assertEqual(f.read(), 'far')
+    
+    def test_index_reload(self):
+        entry = self.trash.put(self.make_file('data.txt', 'abc'))
+        self.assertEqual(entry['size'], 3)
+        os.makedirs(os.path.join(self.trash.path, 'old_format_dir'))
+        again = Trash(self.trash.path)
+        self.assertEqual([e['id'] for e in again.entries()], [entry['id']])
+    
+    def test_directory_size_measured(self):
+        self.make_file('folder/a.txt', 'x' * 10)
+        self.make_file('folder/sub/b.txt', 'y' * 5)
+        entry = self.trash.put(os.path.join(self.test_dir, 'folder'))
+        self.assertIsNone(entry['size'])
+        self.trash.collect()
+        self.assertEqual(self.trash.get(entry['id'])['size'], 15)
+        self.assertEqual(Trash(self.trash.path).get(entry['id'])['size'], 15)
+    
+    def test_quota_evicts_oldest(self):
+        self.trash.max_bytes = 25
+        ids = [self.trash.put(self.make_file(f'f{i}.txt', 'x' * 10))['id'] for i in range(4)]
+        self.assertEqual(self.trash.collect(), ids[:2])
+        self.assertEqual([e['id'] for e in self.trash.entries()], ids[2:])
+        self.assertFalse(os.path.exists(os.path.join(self.trash.path, ids[0])))
+    
+    def test_max_age(self):
+        self.trash.max_age = timedelta(days=1)
+        entry = self.trash.put(self.make_file('old.txt'))
+        self.assertEqual(self.trash.collect(), [])
+        self.assertEqual(self.trash.collect(now=datetime.now() + timedelta(days=2)), [entry['id']])
+    
+    def test_purge(self):
+        first = self.trash.put(self.make_file('a.txt'))
+        self.trash.put(self.make_file('b.txt'))
+        self.trash.remove(first['id'])
+        self.assertEqual(len(self.trash.entries()), 1)
+        self.assertEqual(len(self.trash.purge()), 1)
+        self.assertEqual(os.listdir(self.trash.path), [])
+    
+    def test_background_gc(self):
+        self.trash.max_bytes = 5
+        self.trash.start_gc(interval=60)
+        try:
+            self.trash.put(self.make_file('big.txt', 'x' * 10))
+            deadline = time.time() + 5
+            while self.trash.entries() and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.trash.entries(), [])
+        finally:
+            self.trash.stop_gc()
+    
+    def test_unknown_id(self):
+        with self.assertRaises(KeyError):
+            self.trash.restore('nope')
+        with self.assertRaises(KeyError):
+            self.trash.get('..')
+
+if __name__ == '__main__':
+    unittest.main()